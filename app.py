@@ -1,15 +1,27 @@
 import dash
 from dash import dcc, html, Output, Input, State
 import os
-import yaml
 import time
 import json
 import logging
-from data_generators import DimensionGenerator, FactGenerator, ChangeFeedGenerator, BaseGenerator
+import math
+import secrets
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from data_generators import DimensionGenerator, BaseGenerator
+from data_generators.change_feed_generator import resolve_change_feed_mode
+from data_generators.distributed import RemoteExecutor
+from data_generators.parallel import clear_generators, generate_table, merge_shard_results, shard_tasks, table_seed
+from data_generators.upload_pool import UploadPool
+from data_generators.metrics import GenerationMetrics
+from data_generators.rate import RATED_TABLE_TYPES, RateController
+from data_generators.schema_registry import load_schema_directory, scaled_num_rows
+from data_generators.writers import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS
 from dash.dependencies import ClientsideFunction
 from threading import Thread
 import threading
-from flask import jsonify
+from flask import Response, jsonify, request
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +30,37 @@ logger = logging.getLogger(__name__)
 # Constants
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 SCHEMA_BASE_PATH = os.path.join(APP_DIR, "schema")
+# Optional pooled Faker mode: sample string columns from precomputed value pools
+FAKER_POOL_SIZE = int(os.environ.get("STREAMFORGE_FAKER_POOL_SIZE", "0")) or None
+FAKER_POOL_DIR = os.environ.get("STREAMFORGE_FAKER_POOL_DIR") or None
+# Worker processes used to generate tables in parallel (0 or 1 keeps generation in-thread)
+GENERATION_WORKERS = int(os.environ.get("STREAMFORGE_GENERATION_WORKERS", "0"))
+# Tables are generated and written in chunks of this many rows to bound memory
+CHUNK_ROWS = int(os.environ.get("STREAMFORGE_CHUNK_ROWS", "1000000"))
+# Coordinator mode: comma-separated URLs of generation workers (worker.py) that generate the tables instead of this process
+WORKER_URLS = [url.strip() for url in os.environ.get("STREAMFORGE_WORKER_URLS", "").split(",") if url.strip()]
+# With worker processes, split tables larger than this many rows into row-range shards (0 disables)
+SHARD_ROWS = int(os.environ.get("STREAMFORGE_SHARD_ROWS", "0"))
+# Threads uploading to volumes while the next table is generated (0 uploads each table in turn)
+UPLOAD_WORKERS = int(os.environ.get("STREAMFORGE_UPLOAD_WORKERS", "0"))
+UPLOAD_RETRIES = int(os.environ.get("STREAMFORGE_UPLOAD_RETRIES", "3"))
+# Concurrent deletes when clearing the output directory, optionally in the background
+CLEANUP_WORKERS = int(os.environ.get("STREAMFORGE_CLEANUP_WORKERS", "16"))
+# Iterations start on a fixed cadence; optional industry-wide throughput target (rows or MB per second)
+GENERATION_INTERVAL_SECONDS = float(os.environ.get("STREAMFORGE_INTERVAL_SECONDS", "15"))
+TARGET_ROWS_PER_SECOND = float(os.environ.get("STREAMFORGE_ROWS_PER_SECOND", "0")) or None
+TARGET_MB_PER_SECOND = float(os.environ.get("STREAMFORGE_MB_PER_SECOND", "0")) or None
+BACKGROUND_CLEANUP = os.environ.get("STREAMFORGE_BACKGROUND_CLEANUP", "").strip().lower() in ("1", "true", "yes")
+# Default change feed mode ("history" or "incremental"); a table's change_feed_rules.mode overrides it
+CHANGE_FEED_MODE = os.environ.get("STREAMFORGE_CHANGE_FEED_MODE", "history")
+# Rows appended to every dimension on each iteration after the first (0 keeps dimensions fixed);
+# a dimension's growth_rows in its schema overrides it. Both are multiplied by the scale factor
+DIMENSION_GROWTH_ROWS = int(os.environ.get("STREAMFORGE_DIMENSION_GROWTH_ROWS", "0"))
+# Default scale factor: every schema's num_rows (and so the dimension key ranges) is multiplied by it
+SCALE_FACTOR = float(os.environ.get("STREAMFORGE_SCALE_FACTOR", "1"))
+# Upper bound of datetime columns without a range, as an ISO timestamp; the run's start time if unset.
+# Pin it together with the seed to reproduce a run byte for byte
+REFERENCE_TIME = os.environ.get("STREAMFORGE_REFERENCE_TIME") or None
 
 # Theme configuration
 DB_COLORS = {
@@ -70,6 +113,8 @@ STYLES = {
 
 # Global state
 dimension_key_ranges = {}
+# Rows written so far per table: growing dimensions append after them, fact keys continue after them
+written_rows = {}
 status = {
     "running": False,
     "industry": None,
@@ -84,41 +129,200 @@ status = {
     "path_input": None,
     "selected_dlt_output": None,
     "selected_dlt_mode": None,
-    "duration_hours": 4  # Default to 4 hours
+    "selected_output_format": DEFAULT_OUTPUT_FORMAT,
+    "output_format": None,  # Format the latest iteration wrote its files in
+    "duration_hours": 4,  # Default to 4 hours
+    "selected_seed": None,
+    "seed": None,
+    "selected_scale_factor": None,
+    "scale_factor": SCALE_FACTOR,
+    "reference_time": None,
+    "executor": None,
+    "remote_executor": None,  # RemoteExecutor in coordinator mode
+    "upload_pool": None,
+    "rate_controller": None,
+    "metrics": None,  # GenerationMetrics of the current or last run
+    "stop_event": None,
+    "progress": {}
 }
 
-def generation_service():
-    """Background service that runs file generation."""
-    while status["running"]:
+def get_generation_executor():
+    """Return the shared process pool, creating it on first use."""
+    with status["lock"]:
+        if status["executor"] is None:
+            # Spawn rather than fork: generation runs in a thread of the web server
+            status["executor"] = ProcessPoolExecutor(
+                max_workers=GENERATION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started generation process pool with {GENERATION_WORKERS} workers")
+        return status["executor"]
+
+def shutdown_generation_executor():
+    """Shut down the shared process pool if one is running."""
+    with status["lock"]:
+        executor, status["executor"] = status["executor"], None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Generation process pool shut down")
+
+def get_remote_executor():
+    """Return the shared connection to the generation workers, creating it on first use."""
+    with status["lock"]:
+        if status["remote_executor"] is None:
+            status["remote_executor"] = RemoteExecutor(WORKER_URLS)
+        return status["remote_executor"]
+
+def shutdown_remote_executor():
+    """Stop handing tasks to the generation workers; tasks they are running still finish there."""
+    with status["lock"]:
+        executor, status["remote_executor"] = status["remote_executor"], None
+    if executor is not None:
+        executor.shutdown()
+        logger.info("Disconnected from generation workers")
+
+def get_upload_pool():
+    """Return the shared upload pool, creating it on first use."""
+    with status["lock"]:
+        if status["upload_pool"] is None:
+            status["upload_pool"] = UploadPool(workers=UPLOAD_WORKERS, retries=UPLOAD_RETRIES)
+            logger.info(f"Started upload pool with {UPLOAD_WORKERS} workers")
+        return status["upload_pool"]
+
+def shutdown_upload_pool():
+    """Shut down the shared upload pool if one is running."""
+    with status["lock"]:
+        upload_pool, status["upload_pool"] = status["upload_pool"], None
+    if upload_pool is not None:
+        upload_pool.shutdown(wait=False)
+        logger.info("Upload pool shut down")
+
+def is_current_run(stop_event):
+    """Whether ``stop_event`` belongs to the active run (callers hold status["lock"])."""
+    return stop_event is None or status["stop_event"] is stop_event
+
+def publish_progress(stop_event, **fields):
+    """Record generation progress for the UI; only holds the lock for the update.
+    
+    Updates from a run that was stopped while finishing a table are dropped,
+    so they never leak into the progress of the next run.
+    """
+    with status["lock"]:
+        if is_current_run(stop_event):
+            status["progress"].update(fields)
+
+def run_table_tasks(tasks, stop_event=None):
+    """Generate the given tables, fanning out to worker processes when enabled.
+    
+    In-thread generation checks ``stop_event`` between tables and returns
+    early once it is set. With WORKER_URLS the tables go to the generation
+    workers instead of local processes. Stateful tasks (incremental change
+    feeds) always run in-thread so their state carries over to the next
+    iteration.
+    """
+    upload_pool = None
+    submit = None
+    if WORKER_URLS:
+        submit = get_remote_executor().submit
+    elif GENERATION_WORKERS > 1 and len(tasks) > 1:
+        executor = get_generation_executor()
+        submit = lambda task: executor.submit(generate_table, task)
+    if submit is not None:
+        futures = [(task, None if task.get("stateful") else submit(task)) for task in tasks]
+    else:
+        futures = [(task, None) for task in tasks]
+        # In-thread generation overlaps each table's upload with generating the next
+        if UPLOAD_WORKERS > 0 and tasks and not tasks[0]["is_local"]:
+            upload_pool = get_upload_pool()
+
+    results = []
+    for task, future in futures:
+        if future is None and stop_event is not None and stop_event.is_set():
+            logger.info(f"Stop requested, skipping the remaining {len(tasks) - len(results)} tables")
+            break
+        publish_progress(stop_event, current_table=task["table"])
         try:
-            with status["lock"]:
-                if not status["running"]:
-                    break
-                generate_files_for_industry(status["industry"])
+            result = future.result() if future is not None else generate_table(task, upload_pool)
+        except Exception as e:
+            logger.error(f"Error processing table {task['table']}: {str(e)}")
+            raise
+        logger.info(
+            f"Table {result['table']}: {result['rows']} rows generated in {result['generate_seconds']:.2f}s, "
+            f"saved in {result['save_seconds']:.2f}s -> {result['output_path']}"
+        )
+        results.append(result)
+        publish_progress(stop_event, tables_done=len(results))
+
+    if upload_pool is not None:
+        start = time.perf_counter()
+        uploads = upload_pool.drain()
+        logger.info(
+            f"Waited {time.perf_counter() - start:.2f}s for {len(uploads)} uploads to finish "
+            f"({sum(u['retries'] for u in uploads)} retries, generation blocked {upload_pool.blocked_seconds:.2f}s in total)"
+        )
+        upload_seconds = {u["output_path"]: u["upload_seconds"] for u in uploads}
+        for result in results:
+            result["upload_seconds"] = upload_seconds.get(result["output_path"], result["upload_seconds"])
+    return results
+
+def generation_service(stop_event):
+    """Background service that runs file generation until ``stop_event`` is set.
+    
+    Generation runs without holding status["lock"]; each iteration
+    snapshots the settings it needs and publishes progress in short
+    locked updates, so UI callbacks stay responsive.
+    """
+    rate_controller = RateController(
+        GENERATION_INTERVAL_SECONDS, TARGET_ROWS_PER_SECOND, TARGET_MB_PER_SECOND, stop_event=stop_event
+    )
+    with status["lock"]:
+        status["rate_controller"] = rate_controller
+        industry = status["industry"]
+        metrics = GenerationMetrics(industry, GENERATION_INTERVAL_SECONDS)
+        if is_current_run(stop_event):
+            status["metrics"] = metrics
+    while not stop_event.is_set():
+        try:
+            rate_controller.start_iteration()
+            generate_files_for_industry(industry, rate_controller, stop_event, metrics=metrics)
         except Exception as e:
+            if stop_event.is_set():
+                # Pools shut down by a stop fail the tables still in flight
+                logger.info(f"Generation stopped during an iteration: {str(e)}")
+                break
             logger.error(f"Error in generation service: {str(e)}")
             with status["lock"]:
-                status["running"] = False
-                status["thread"] = None
+                if status["stop_event"] is stop_event:
+                    status["running"] = False
+                    status["thread"] = None
             break
-        time.sleep(15)  # Wait 15 seconds between iterations
+        # Wait out the rest of the interval; stopping interrupts the wait
+        rate_controller.wait()
 
 def start_generation_thread():
     """Start the generation thread if it's not already running."""
     with status["lock"]:
         if status["thread"] is None:
             status["running"] = True  # Set running state before starting thread
-            status["thread"] = Thread(target=generation_service)
+            # Each run gets its own stop event, so a run still winding down never sees the next one's state
+            status["stop_event"] = threading.Event()
+            status["progress"] = {}
+            status["thread"] = Thread(target=generation_service, args=(status["stop_event"],))
             status["thread"].start()
             print("Started generation thread, running state:", status["running"])  # Debug log
 
 def stop_generation_thread():
-    """Stop the generation thread if it's running."""
+    """Stop the generation thread if it's running.
+    
+    Safe to call from any callback as long as status["lock"] is not held:
+    the lock only covers the state reset, never the wait for the thread.
+    """
     with status["lock"]:
-        if status["thread"]:
+        thread = status["thread"]
+        if thread:
             print("Stopping background thread...")
             status["running"] = False
-            status["thread"].join(timeout=5)  # Wait up to 5 seconds for thread to finish
+            status["stop_event"].set()
             status["thread"] = None
             # Reset all state
             status["industry"] = None
@@ -126,9 +330,51 @@ def stop_generation_thread():
             status["start_time"] = None
             status["dlt_code"] = None
             status["output_path"] = None
+            status["seed"] = None
+            status["reference_time"] = None
+            status["output_format"] = None
+            status["rate_controller"] = None
+            status["progress"] = {}
             # Don't reset selected_language, selected_industry, path_input, and selected_dlt_output
             # as they are UI state that should persist
-            print("Background thread stopped and state reset")
+    # Cancel queued work first so the thread is not left waiting on it
+    shutdown_generation_executor()
+    shutdown_remote_executor()
+    shutdown_upload_pool()
+    clear_generators()
+    if thread and thread is not threading.current_thread():
+        thread.join(timeout=5)  # Wait up to 5 seconds for thread to finish
+        print("Background thread stopped and state reset")
+
+def begin_generation_run(industry, output_path, seed=None, scale_factor=None):
+    """Reset the run state and start generating ``industry`` into ``output_path``.
+
+    Shared by the Start button and POST /api/start; the caller validates the
+    inputs. A ``seed`` reproduces an earlier run, otherwise one is drawn on
+    the first iteration; ``scale_factor`` defaults to STREAMFORGE_SCALE_FACTOR.
+    """
+    global dimension_key_ranges, written_rows
+    with status["lock"]:
+        status['iteration_count'] = 0
+        status['start_time'] = time.time()
+        status['dlt_code'] = None
+        status['output_path'] = output_path
+        status['seed'] = int(seed) if seed is not None else None
+        status['scale_factor'] = float(scale_factor) if scale_factor is not None else SCALE_FACTOR
+        status['reference_time'] = None
+        dimension_key_ranges = {}
+        written_rows = {}
+        status["running"] = True
+        status["industry"] = industry
+        
+        # Debug logging for path setting
+        logger.info(f"DEBUG START - path_input received: '{output_path}'")
+        logger.info(f"DEBUG START - status['output_path'] set to: '{status['output_path']}'")
+        logger.info(f"DEBUG START - status['output_path'] (stripped): '{status['output_path'].strip()}'")
+        logger.info(f"DEBUG START - path starts with /volumes/ (case-insensitive): {status['output_path'].strip().lower().startswith('/volumes/')}")
+    
+    # Start the generation thread
+    start_generation_thread()
 
 # Initialize Dash app
 app = dash.Dash(__name__)
@@ -149,10 +395,78 @@ def get_state():
             "path_input": status["path_input"],
             "selected_dlt_output": status["selected_dlt_output"],
             "selected_dlt_mode": status["selected_dlt_mode"],
-            "duration_hours": status["duration_hours"]
+            "selected_output_format": status["selected_output_format"],
+            "duration_hours": status["duration_hours"],
+            "selected_seed": status["selected_seed"],
+            "seed": status["seed"],
+            "selected_scale_factor": status["selected_scale_factor"],
+            "scale_factor": status["scale_factor"],
+            "progress": dict(status["progress"])
         }
-        print("Returning state:", state)  # Add debug logging
-        return jsonify(state)
+    print("Returning state:", state)  # Add debug logging
+    return jsonify(state)
+
+@app.server.route('/api/start', methods=['POST'])
+def start_run():
+    """Start a run from JSON: industry and output_path, optionally output_format, seed and scale_factor."""
+    body = request.get_json(silent=True) or {}
+    industry = body.get("industry")
+    output_path = (body.get("output_path") or "").strip()
+    output_format = body.get("output_format") or DEFAULT_OUTPUT_FORMAT
+    seed = body.get("seed")
+    scale_factor = body.get("scale_factor")
+    if industry not in list_industries():
+        return jsonify({"error": f"Unknown industry {industry!r}; choose from {', '.join(sorted(list_industries()))}"}), 400
+    if not output_path:
+        return jsonify({"error": "output_path is required"}), 400
+    if output_format not in OUTPUT_FORMATS:
+        return jsonify({"error": f"Unknown output_format {output_format!r}; choose from {', '.join(OUTPUT_FORMATS)}"}), 400
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+        return jsonify({"error": "seed must be a whole, non-negative number"}), 400
+    if scale_factor is not None and (not isinstance(scale_factor, (int, float)) or isinstance(scale_factor, bool) or scale_factor <= 0):
+        return jsonify({"error": "scale_factor must be a positive number"}), 400
+
+    with status["lock"]:
+        if status["running"]:
+            return jsonify({"error": f"A run for {status['industry']} is already active"}), 409
+        status["selected_industry"] = industry
+        status["path_input"] = output_path
+        status["selected_output_format"] = output_format
+        status["selected_seed"] = seed
+        status["selected_scale_factor"] = scale_factor
+    begin_generation_run(industry, output_path, seed, scale_factor)
+    return jsonify({"running": True, "industry": industry, "seed": seed,
+                    "scale_factor": float(scale_factor) if scale_factor is not None else SCALE_FACTOR})
+
+@app.server.route('/api/stop', methods=['POST'])
+def stop_run():
+    """Stop the active run, if any."""
+    stop_generation_thread()
+    return jsonify({"running": False})
+
+@app.server.route('/api/metrics')
+def get_metrics():
+    """Metrics of the current or last run as JSON, or as Prometheus text with ?format=prometheus."""
+    with status["lock"]:
+        running = status["running"]
+        metrics = status["metrics"]
+    if request.args.get("format") == "prometheus":
+        body = (
+            "# HELP streamforge_running Whether a generation run is active.\n"
+            "# TYPE streamforge_running gauge\n"
+            f"streamforge_running {int(running)}\n"
+        )
+        if metrics is not None:
+            body += metrics.prometheus()
+        return Response(body, mimetype="text/plain; version=0.0.4")
+    return jsonify({"running": running, "metrics": metrics.snapshot() if metrics is not None else None})
+
+@app.server.route('/api/workers')
+def get_workers():
+    """Progress of each generation worker in coordinator mode."""
+    with status["lock"]:
+        executor = status["remote_executor"]
+    return jsonify({"worker_urls": WORKER_URLS, "workers": executor.worker_status() if executor is not None else {}})
 
 # Add custom CSS for Inter font and Font Awesome
 app.index_string = '''
@@ -191,19 +505,37 @@ def list_industries():
     ]
 
 def load_all_schemas(industry):
-    """Load all schema files for an industry."""
+    """Load all schema files for an industry.
+    
+    Schemas come from the process-wide registry, which only re-parses files
+    whose modification time changed, and are shared with the generators.
+    """
     industry_path = os.path.join(SCHEMA_BASE_PATH, industry)
-    schemas = []
-    for file in os.listdir(industry_path):
-        if file.endswith((".yml", ".yaml")):
-            with open(os.path.join(industry_path, file)) as f:
-                schema = yaml.safe_load(f)
-                schemas.append(schema)
-    return schemas
-
-def generate_dlt_references(schema, output_path, table_type):
-    """Generate DLT reference code for a table in both SQL and Python."""
+    return list(load_schema_directory(industry_path).values())
+
+def get_read_options(output_format):
+    """read_files / Auto Loader options for files written in the given output format."""
+    reader = OUTPUT_FORMATS[output_format]["reader"]
+    if reader == "parquet":
+        # Parquet carries its own schema, so no type inference is needed
+        options = [("format", "parquet")]
+    elif reader == "json":
+        options = [("format", "json"), ("inferColumnTypes", "true")]
+    else:
+        # Compressed CSV is decompressed by Spark based on the file extension
+        options = [("format", "csv"), ("inferColumnTypes", "true"), ("multiLine", "true")]
+
+    sql = ", ".join(f'{key} => "{value}"' for key, value in options)
+    python = "\n".join(
+        f'        .option("{key if key == "multiLine" else "cloudFiles." + key}", "{value}")'
+        for key, value in options
+    )
+    return sql, python
+
+def generate_dlt_references(schema, output_path, table_type, output_format):
+    """Generate DLT reference code for a table in both SQL and Python, reading files in ``output_format``."""
     table_name = schema["table"]
+    read_options_sql, read_options_python = get_read_options(output_format)
     
     # Generate quality constraints only for fact and dimension tables
     quality_constraints = []
@@ -268,7 +600,7 @@ def generate_dlt_references(schema, output_path, table_type):
 -- Create streaming table for raw data
 CREATE OR REFRESH STREAMING TABLE bronze.{table_name}
 COMMENT '{get_table_comment("Bronze", table_name, "change feed")}'
-AS SELECT * FROM STREAM read_files("{output_path}/", format => "csv", inferColumnTypes => "true", multiLine => "true");
+AS SELECT * FROM STREAM read_files("{output_path}/", {read_options_sql});
 
 -- Create streaming table
 CREATE OR REFRESH STREAMING TABLE silver.{table_name}
@@ -295,9 +627,7 @@ STORED AS SCD TYPE {2 if status["selected_dlt_mode"] == "full_code" else "<CHANG
 def source():
     return (spark.readStream
         .format("cloudFiles")
-        .option("cloudFiles.format", "csv")
-        .option("cloudFiles.inferColumnTypes", "true")
-        .option("multiLine", "true")
+{read_options_python}
         .load("{output_path}/")
     )
 
@@ -321,16 +651,14 @@ dlt.create_auto_cdc_flow(
             sql_code = f'''
 CREATE OR REFRESH STREAMING TABLE bronze.{table_name}
 COMMENT '{get_table_comment("Bronze", table_name, table_type)}'
-AS SELECT * FROM STREAM read_files("{output_path}/", format => "csv", inferColumnTypes => "true", multiLine => "true")
+AS SELECT * FROM STREAM read_files("{output_path}/", {read_options_sql})
 '''
             # Python code for bronze only
             python_code = f'''@dlt.table(name="bronze.{table_name}")
 def {table_name}():
     return (spark.readStream
         .format("cloudFiles")
-        .option("cloudFiles.format", "csv")
-        .option("cloudFiles.inferColumnTypes", "true")
-        .option("multiLine", "true")
+{read_options_python}
         .load("{output_path}/")
     )
 '''
@@ -351,7 +679,7 @@ def {table_name}():
 -- Create bronze table
 CREATE OR REFRESH STREAMING TABLE bronze.{table_name}
 COMMENT '{get_table_comment("Bronze", table_name, table_type)}'
-AS SELECT * FROM STREAM read_files("{output_path}/", format => "csv", inferColumnTypes => "true", multiLine => "true");
+AS SELECT * FROM STREAM read_files("{output_path}/", {read_options_sql});
 
 -- Create silver table with constraints
 CREATE OR REFRESH STREAMING TABLE silver.{table_name}{constraints_sql}
@@ -373,9 +701,7 @@ AS SELECT * FROM STREAM(bronze.{table_name})
 def {table_name}_bronze():
     return (spark.readStream
         .format("cloudFiles")
-        .option("cloudFiles.format", "csv")
-        .option("cloudFiles.inferColumnTypes", "true")
-        .option("multiLine", "true")
+{read_options_python}
         .load("{output_path}/")
     )
 
@@ -390,35 +716,68 @@ def {table_name}_silver():
         'python': python_code
     }
 
-def generate_files_for_industry(industry):
-    """Generate all data files for an industry."""
-    global dimension_key_ranges, status
+def generate_files_for_industry(industry, rate_controller=None, stop_event=None, num_rows=None, metrics=None):
+    """Generate all data files for an industry and return the per-table results.
+    
+    The settings the iteration needs are copied under status["lock"] up
+    front; generation itself runs without the lock. With a rate controller,
+    fact and change feed tables are sized to its throughput targets and the
+    achieved rate is reported after the iteration. ``num_rows`` instead sets
+    the row count of every fact and change feed table. The iteration's
+    per-table results and timing are added to ``metrics``, if given.
+    """
+    global dimension_key_ranges, written_rows, status
+
+    started = time.perf_counter()
 
-    current_iteration = status['iteration_count']
-    status['iteration_count'] += 1
+    with status["lock"]:
+        current_iteration = status['iteration_count']
+        status['iteration_count'] += 1
+        if status['seed'] is None:
+            # Record a base seed so every table's stream can be reproduced later
+            status['seed'] = secrets.randbits(32)
+        if status['reference_time'] is None:
+            status['reference_time'] = datetime.fromisoformat(REFERENCE_TIME).timestamp() if REFERENCE_TIME else time.time()
+        if current_iteration == 0:
+            logger.info(
+                f"Run seed: {status['seed']}, scale factor: {status['scale_factor']:g}, reference time: "
+                f"{datetime.fromtimestamp(status['reference_time']).astimezone().isoformat()}"
+            )
+        output_path = status['output_path']
+        output_format = status["selected_output_format"] or DEFAULT_OUTPUT_FORMAT
+        status['output_format'] = output_format
+        seed = status['seed']
+        scale_factor = status['scale_factor']
+        reference_time = status['reference_time']
+        key_ranges = {} if current_iteration == 0 else dict(dimension_key_ranges)
+        table_rows = {} if current_iteration == 0 else dict(written_rows)
+        if is_current_run(stop_event):
+            status["progress"] = {"iteration": current_iteration, "phase": "generating", "tables_done": 0}
 
     logger.info(f"\nIteration {current_iteration} for industry {industry}")
-    logger.debug(f"Current dimension_key_ranges: {dimension_key_ranges}")
+    logger.debug(f"Current dimension_key_ranges: {key_ranges}")
 
     schemas = load_all_schemas(industry)
     dlt_references = []
 
     # Check and clean up output directory before starting
     if current_iteration == 0:
-        output_dir = os.path.join(status['output_path'], industry)
+        # Generators are reused across iterations of a run, not across runs
+        clear_generators()
+        output_dir = os.path.join(output_path, industry)
         # Create a temporary generator instance to handle directory cleanup
-        is_local = not status['output_path'].strip().lower().startswith('/volumes/')
+        is_local = not output_path.strip().lower().startswith('/volumes/')
         
         # Debug logging for cleanup
-        logger.info(f"DEBUG CLEANUP - Output path: '{status['output_path']}'")
-        logger.info(f"DEBUG CLEANUP - Output path (stripped): '{status['output_path'].strip()}'")
-        logger.info(f"DEBUG CLEANUP - Starts with /volumes/ (case-insensitive): {status['output_path'].strip().lower().startswith('/volumes/')}")
+        logger.info(f"DEBUG CLEANUP - Output path: '{output_path}'")
+        logger.info(f"DEBUG CLEANUP - Output path (stripped): '{output_path.strip()}'")
+        logger.info(f"DEBUG CLEANUP - Starts with /volumes/ (case-insensitive): {output_path.strip().lower().startswith('/volumes/')}")
         logger.info(f"DEBUG CLEANUP - is_local determined as: {is_local}")
         logger.info(f"DEBUG CLEANUP - output_dir: {output_dir}")
         
         # Use DimensionGenerator since it's the simplest concrete implementation
-        temp_generator = DimensionGenerator(None, status['output_path'], is_local=is_local)
-        temp_generator._check_directory_empty(output_dir)
+        temp_generator = DimensionGenerator(None, output_path, is_local=is_local)
+        temp_generator._check_directory_empty(output_dir, background=BACKGROUND_CLEANUP, workers=CLEANUP_WORKERS)
 
     # Store dimension key ranges in first iteration
     if current_iteration == 0:
@@ -426,65 +785,122 @@ def generate_files_for_industry(industry):
             if schema.get("type", "fact") == "dimension":
                 for col in schema["columns"]:
                     if col.endswith("_id"):
-                        dimension_key_ranges[col] = schema.get("num_rows", 10)
-                        logger.debug(f"Storing dimension key range for {col}: {dimension_key_ranges[col]}")
+                        key_ranges[col] = scaled_num_rows(schema, scale_factor)
+                        logger.debug(f"Storing dimension key range for {col}: {key_ranges[col]}")
+                table_rows[schema["table"]] = scaled_num_rows(schema, scale_factor)
+        with status["lock"]:
+            if is_current_run(stop_event):
+                dimension_key_ranges = key_ranges
+                written_rows = table_rows
 
-    # Process all tables
+    # Determine if we're in a local environment based on the output path
+    is_local = not output_path.strip().lower().startswith('/volumes/')
+    
+    # Row counts sized to the throughput targets, if any
+    rate_plan = rate_controller.plan(schemas) if rate_controller is not None else {}
+    if num_rows:
+        rate_plan = {s["table"]: num_rows for s in schemas if s.get("type", "fact") in RATED_TABLE_TYPES}
+    
+    # Build one task per table for this iteration
+    tasks = []
+    schemas_by_table = {}
     for schema in schemas:
         table = schema["table"]
         table_type = schema.get("type", "fact")
 
         logger.info(f"\nProcessing table: {table} (type: {table_type})")
 
-        # Skip dimension tables after first iteration
+        # After the first iteration dimensions only grow, by growth_rows new rows in a new file
+        row_offset = 0
+        table_num_rows = rate_plan.get(table)
         if table_type == "dimension" and current_iteration > 0:
-            logger.info(f"Skipping dimension table {table} as iteration_count > 0")
-            continue
-
-        try:
-            schema_path = os.path.join(SCHEMA_BASE_PATH, industry, f"{table}.yml")
-            logger.info(f"Loading schema from: {schema_path}")
-            
-            # Determine if we're in a local environment based on the output path
-            is_local = not status['output_path'].strip().lower().startswith('/volumes/')
-            
-            # Debug logging
-            logger.info(f"DEBUG - Output path: '{status['output_path']}'")
-            logger.info(f"DEBUG - Output path (stripped): '{status['output_path'].strip()}'")
-            logger.info(f"DEBUG - Starts with /volumes/ (case-insensitive): {status['output_path'].strip().lower().startswith('/volumes/')}")
-            logger.info(f"DEBUG - is_local determined as: {is_local}")
-            
-            # Select appropriate generator based on table type
-            if table_type == "dimension":
-                generator = DimensionGenerator(schema_path, status['output_path'], is_local=is_local)
-            elif table_type == "fact":
-                generator = FactGenerator(schema_path, status['output_path'], dimension_key_ranges, is_local=is_local)
-            elif table_type == "change_feed":
-                generator = ChangeFeedGenerator(schema_path, status['output_path'], is_local=is_local)
-            else:
-                logger.warning(f"Unknown table type: {table_type}")
+            growth_rows = round(schema.get("growth_rows", DIMENSION_GROWTH_ROWS) * scale_factor)
+            if growth_rows <= 0 or table not in table_rows:
+                logger.info(f"Skipping dimension table {table} as iteration_count > 0")
                 continue
+            row_offset, table_num_rows = table_rows[table], growth_rows
+            logger.info(f"Appending {growth_rows} rows to dimension {table} after row {row_offset}")
+        elif table_type == "fact":
+            # Fact surrogate keys continue after the rows of earlier iterations
+            row_offset = table_rows.get(table, 0)
+
+        if table_type not in ("dimension", "fact", "change_feed"):
+            logger.warning(f"Unknown table type: {table_type}")
+            continue
 
-            # Generate and save data
-            logger.info(f"Generating data for table: {table}")
-            df = generator.generate_data()
-            logger.info(f"Saving data for table: {table}")
-            output_path = generator.save_data(df, table)
-            logger.info(f"Data saved to: {output_path}")
-            
-            # Generate DLT references for first iteration
-            if current_iteration == 0:
-                logger.info(f"Generating DLT references for table: {table}")
-                dlt_refs = generate_dlt_references(schema, output_path, table_type)
-                dlt_references.append({
-                    "table": table,
-                    "type": table_type,
-                    "references": dlt_refs
-                })
+        change_feed_mode = resolve_change_feed_mode(schema, CHANGE_FEED_MODE) if table_type == "change_feed" else None
+        schemas_by_table[table] = schema
+        task = {
+            "table": table,
+            "table_type": table_type,
+            "schema_path": os.path.join(SCHEMA_BASE_PATH, industry, f"{table}.yml"),
+            "output_path": output_path,
+            "is_local": is_local,
+            "dimension_key_ranges": dict(key_ranges),
+            "iteration": current_iteration,
+            "seed": table_seed(seed, current_iteration, table),
+            "reference_time": reference_time,
+            "scale_factor": scale_factor,
+            "chunk_rows": CHUNK_ROWS,
+            "output_format": output_format,
+            "faker_pool_size": FAKER_POOL_SIZE,
+            "faker_pool_dir": FAKER_POOL_DIR,
+            "num_rows": table_num_rows,
+            "row_offset": row_offset,
+            "change_feed_mode": change_feed_mode,
+            "stateful": change_feed_mode == "incremental",
+        }
+        # Split big tables into row ranges generated by separate workers, one part file each
+        shards = 1
+        if SHARD_ROWS > 0 and (GENERATION_WORKERS > 1 or WORKER_URLS) and not task["stateful"]:
+            rows = table_num_rows or scaled_num_rows(schema, scale_factor)
+            shards = min(math.ceil(rows / SHARD_ROWS), rows)
+            if shards > 1:
+                logger.info(f"Splitting {table} ({rows} rows) into {shards} shards")
+        tasks.extend(shard_tasks(task, shards))
+
+    # Generate and save data
+    iteration_start = time.perf_counter()
+    publish_progress(stop_event, tables_total=len(tasks))
+    results = merge_shard_results(run_table_tasks(tasks, stop_event))
+    iteration_seconds = time.perf_counter() - iteration_start
+    logger.info(f"Generated {len(results)} tables in {iteration_seconds:.2f}s")
+    publish_progress(stop_event, phase="waiting", current_table=None, last_iteration_seconds=round(iteration_seconds, 3))
+    if rate_controller is not None:
+        rate_controller.record([schemas_by_table[r["table"]] for r in results], results)
+    if metrics is not None:
+        lag_seconds = rate_controller.lag_seconds if rate_controller is not None else 0.0
+        metrics.record_iteration(current_iteration, results, time.perf_counter() - started, lag_seconds)
+
+    # Extend the key ranges of grown dimensions only once their new rows are written,
+    # so facts never reference keys that do not exist yet; they see them next iteration
+    for result in results:
+        table = result["table"]
+        if result["table_type"] == "fact":
+            table_rows[table] = table_rows.get(table, 0) + result["rows"]
+        elif result["table_type"] == "dimension" and current_iteration > 0:
+            table_rows[table] += result["rows"]
+            # A dimension's own key is its first _id column
+            key = next((col for col in schemas_by_table[table]["columns"] if col.endswith("_id")), None)
+            if key is not None:
+                key_ranges[key] = table_rows[table]
+                logger.info(f"Dimension {table} now has {table_rows[table]} rows, {key} range extended")
+    with status["lock"]:
+        if is_current_run(stop_event):
+            dimension_key_ranges = key_ranges
+            written_rows = table_rows
 
-        except Exception as e:
-            logger.error(f"Error processing table {table}: {str(e)}")
-            raise
+    # Generate DLT references for first iteration
+    if current_iteration == 0:
+        for result in results:
+            table = result["table"]
+            logger.info(f"Generating DLT references for table: {table}")
+            dlt_refs = generate_dlt_references(schemas_by_table[table], result["output_path"], result["table_type"], output_format)
+            dlt_references.append({
+                "table": table,
+                "type": result["table_type"],
+                "references": dlt_refs
+            })
 
     # Print DLT references after first iteration
     if current_iteration == 0 and dlt_references:
@@ -498,6 +914,7 @@ def generate_files_for_industry(industry):
             logger.debug("\n" + "="*50)
 
     logger.info(f"\nCompleted iteration {current_iteration}")
+    return results
 
 def create_dlt_code_display(dlt_codes, language):
     """Create the DLT code display component."""
@@ -737,6 +1154,22 @@ def create_input_section():
                         'marginRight': '12px'
                     }
                 ),
+                dcc.Dropdown(
+                    id='output-format-dropdown',
+                    options=[{"label": spec["label"], "value": value} for value, spec in OUTPUT_FORMATS.items()],
+                    value=DEFAULT_OUTPUT_FORMAT,
+                    placeholder="Choose Output Format",
+                    clearable=False,
+                    style={
+                        'border': f'1px solid {DB_COLORS["border"]}',
+                        'borderRadius': '4px',
+                        'fontSize': '14px',
+                        'width': '200px',
+                        'display': 'inline-block',
+                        'verticalAlign': 'middle',
+                        'marginRight': '12px'
+                    }
+                ),
             ], style={'marginBottom': '20px', 'textAlign': 'center'}),
             html.Div([
                 html.Div([
@@ -773,6 +1206,73 @@ def create_input_section():
                     'verticalAlign': 'middle',
                     'textAlign': 'left'
                 }),
+                html.Div([
+                    html.Label(
+                        "Seed:",
+                        style={
+                            'display': 'inline-block',
+                            'marginLeft': '24px',
+                            'marginRight': '10px',
+                            'fontSize': '14px',
+                            'fontWeight': '500',
+                            'color': '#666666'
+                        }
+                    ),
+                    dcc.Input(
+                        id='seed-input',
+                        type='number',
+                        min=0,
+                        step=1,
+                        placeholder='Random',  # Leave empty for a new seed every run
+                        style={
+                            'width': '120px',
+                            'padding': '8px 12px',
+                            'border': f'1px solid {DB_COLORS["border"]}',
+                            'borderRadius': '4px',
+                            'fontSize': '14px',
+                            'display': 'inline-block',
+                            'verticalAlign': 'middle',
+                            'color': '#333333'
+                        }
+                    ),
+                ], style={
+                    'display': 'inline-block',
+                    'verticalAlign': 'middle',
+                    'textAlign': 'left'
+                }),
+                html.Div([
+                    html.Label(
+                        "Scale factor:",
+                        style={
+                            'display': 'inline-block',
+                            'marginLeft': '24px',
+                            'marginRight': '10px',
+                            'fontSize': '14px',
+                            'fontWeight': '500',
+                            'color': '#666666'
+                        }
+                    ),
+                    dcc.Input(
+                        id='scale-factor-input',
+                        type='number',
+                        min=0,
+                        placeholder=f'{SCALE_FACTOR:g}',  # Multiplies every table's num_rows
+                        style={
+                            'width': '100px',
+                            'padding': '8px 12px',
+                            'border': f'1px solid {DB_COLORS["border"]}',
+                            'borderRadius': '4px',
+                            'fontSize': '14px',
+                            'display': 'inline-block',
+                            'verticalAlign': 'middle',
+                            'color': '#333333'
+                        }
+                    ),
+                ], style={
+                    'display': 'inline-block',
+                    'verticalAlign': 'middle',
+                    'textAlign': 'left'
+                }),
             ], style={'marginBottom': '20px', 'textAlign': 'center'}),
         ], style={'marginBottom': '20px'}),
 
@@ -795,6 +1295,7 @@ def create_input_section():
                 'fontWeight': '400'
             }
         ),
+        html.Div(id='metrics-display', style={'padding': '0 12px', 'fontSize': '13px', 'color': DB_COLORS['text']}),
     ], style={**STYLES['input_container'], 'paddingBottom': '30px'})
 
 def create_code_section():
@@ -869,33 +1370,85 @@ app.layout = html.Div([
     prevent_initial_call=True
 )
 def update_countdown(n_intervals):
+    # Only copy state under the lock; stopping takes the lock itself
     with status["lock"]:
         if not status["running"] or not status["start_time"]:
             return dash.no_update, True
-        
-        # Calculate remaining time
-        duration_seconds = status["duration_hours"] * 3600
-        elapsed_time = time.time() - status['start_time']
-        remaining_seconds = duration_seconds - elapsed_time
-        
-        if remaining_seconds <= 0:
-            stop_generation_thread()
-            return f"Generation stopped after {status['duration_hours']} hours.", True
-        
-        # Calculate remaining time in hours, minutes, and seconds
-        remaining_hours = int(remaining_seconds // 3600)
-        remaining_minutes = int((remaining_seconds % 3600) // 60)
-        remaining_secs = int(remaining_seconds % 60)
-        
-        # Format the remaining time message
-        time_message = f"Generating files for '{status['industry']}'... (Time remaining: "
-        if remaining_hours > 0:
-            time_message += f"{remaining_hours}h "
-        if remaining_minutes > 0 or remaining_hours > 0:
-            time_message += f"{remaining_minutes}m "
-        time_message += f"{remaining_secs}s)"
-        
-        return time_message, False
+        duration_hours = status["duration_hours"]
+        start_time = status['start_time']
+        industry = status['industry']
+    
+    # Calculate remaining time
+    duration_seconds = duration_hours * 3600
+    elapsed_time = time.time() - start_time
+    remaining_seconds = duration_seconds - elapsed_time
+    
+    if remaining_seconds <= 0:
+        stop_generation_thread()
+        return f"Generation stopped after {duration_hours} hours.", True
+    
+    # Calculate remaining time in hours, minutes, and seconds
+    remaining_hours = int(remaining_seconds // 3600)
+    remaining_minutes = int((remaining_seconds % 3600) // 60)
+    remaining_secs = int(remaining_seconds % 60)
+    
+    # Format the remaining time message
+    time_message = f"Generating files for '{industry}'... (Time remaining: "
+    if remaining_hours > 0:
+        time_message += f"{remaining_hours}h "
+    if remaining_minutes > 0 or remaining_hours > 0:
+        time_message += f"{remaining_minutes}m "
+    time_message += f"{remaining_secs}s)"
+    
+    return time_message, False
+
+def create_metrics_display(snapshot):
+    """Summarize the last iteration: per-table rows, bytes and timings, and lag against the cadence."""
+    if not snapshot or not snapshot["iterations"]:
+        return None
+    last = snapshot["iterations"][-1]
+    cell = {'padding': '2px 8px', 'textAlign': 'right'}
+
+    def seconds(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    header = ["Table", "Rows", "MB", "Generate s", "Serialize s", "Write s", "Upload s"]
+    rows = [
+        html.Tr([
+            html.Td(table, style={**cell, 'textAlign': 'left'}),
+            html.Td(f"{t['rows']:,}", style=cell),
+            html.Td(f"{t['bytes'] / 1024 / 1024:.1f}", style=cell),
+            html.Td(seconds(t['generate_seconds']), style=cell),
+            html.Td(seconds(t['serialize_seconds']), style=cell),
+            html.Td(seconds(t['write_seconds']), style=cell),
+            html.Td(seconds(t['upload_seconds']), style=cell),
+        ])
+        for table, t in last["tables"].items()
+    ]
+    summary = (
+        f"Iteration {last['iteration']}: {last['rows']:,} rows, {last['bytes'] / 1024 / 1024:.1f} MB "
+        f"in {last['elapsed_seconds']:.2f}s, started {last['lag_seconds']:.2f}s behind schedule"
+    )
+    if snapshot["interval_seconds"]:
+        summary += f" ({snapshot['overruns']} of {snapshot['iteration_count']} iterations overran the {snapshot['interval_seconds']:.0f}s interval)"
+    return html.Div([
+        html.Div(summary, style={'marginBottom': '6px'}),
+        html.Table(
+            [html.Tr([html.Th(h, style={**cell, 'textAlign': 'left' if i == 0 else 'right'}) for i, h in enumerate(header)])] + rows,
+            style={'borderCollapse': 'collapse', 'width': '100%'}
+        ),
+    ])
+
+# Refresh the metrics panel with the countdown
+@app.callback(
+    Output('metrics-display', 'children'),
+    Input('countdown-timer', 'n_intervals'),
+    prevent_initial_call=True
+)
+def update_metrics_display(n_intervals):
+    with status["lock"]:
+        metrics = status["metrics"]
+    return create_metrics_display(metrics.snapshot() if metrics is not None else None)
 
 # Update the control generation callback to handle interval timer
 @app.callback(
@@ -915,13 +1468,16 @@ def update_countdown(n_intervals):
      State('path-input', 'value'),
      State('dlt-output-dropdown', 'value'),
      State('dlt-mode-dropdown', 'value'),
+     State('output-format-dropdown', 'value'),
      State('duration-input', 'value'),
+     State('seed-input', 'value'),
+     State('scale-factor-input', 'value'),
      State('dlt-code-section', 'style'),
      State('dlt-code-display', 'children')],
     prevent_initial_call=True
 )
-def control_generation(button_clicks, n_intervals, selected_language, selected_industry, path_input, selected_dlt_output, selected_dlt_mode, duration_hours, current_section_style, current_display):
-    global dimension_key_ranges, status
+def control_generation(button_clicks, n_intervals, selected_language, selected_industry, path_input, selected_dlt_output, selected_dlt_mode, selected_output_format, duration_hours, seed_input, scale_factor_input, current_section_style, current_display):
+    global status
     
     ctx = dash.callback_context
     if not ctx.triggered:
@@ -944,8 +1500,12 @@ def control_generation(button_clicks, n_intervals, selected_language, selected_i
             status["selected_dlt_output"] = selected_dlt_output
         if selected_dlt_mode:
             status["selected_dlt_mode"] = selected_dlt_mode
+        if selected_output_format:
+            status["selected_output_format"] = selected_output_format
         if duration_hours:
             status["duration_hours"] = duration_hours
+        status["selected_seed"] = seed_input
+        status["selected_scale_factor"] = scale_factor_input
 
     # Default section style
     section_style = current_section_style if current_section_style else {**STYLES['container'], 'display': 'none'}
@@ -1002,25 +1562,21 @@ def control_generation(button_clicks, n_intervals, selected_language, selected_i
                              style={'color': '#FF3621'})
                 ], style={'padding': '12px'}), "Start", start_style, False, loading_message, section_style, export_button_style, True
 
+            if seed_input is not None and (seed_input < 0 or seed_input != int(seed_input)):
+                return True, html.Div([
+                    html.Span("⚠️ Please enter a whole, non-negative seed or leave it empty.", 
+                             style={'color': '#FF3621'})
+                ], style={'padding': '12px'}), "Start", start_style, False, loading_message, section_style, export_button_style, True
+
+            if scale_factor_input is not None and scale_factor_input <= 0:
+                return True, html.Div([
+                    html.Span("⚠️ Please enter a positive scale factor or leave it empty.", 
+                             style={'color': '#FF3621'})
+                ], style={'padding': '12px'}), "Start", start_style, False, loading_message, section_style, export_button_style, True
+
             try:
                 print("\nStarting generation...")
-                with status["lock"]:
-                    status['iteration_count'] = 0
-                    status['start_time'] = time.time()
-                    status['dlt_code'] = None
-                    status['output_path'] = path_input
-                    dimension_key_ranges = {}
-                    status["running"] = True
-                    status["industry"] = selected_industry
-                    
-                    # Debug logging for path setting
-                    logger.info(f"DEBUG START - path_input received: '{path_input}'")
-                    logger.info(f"DEBUG START - status['output_path'] set to: '{status['output_path']}'")
-                    logger.info(f"DEBUG START - status['output_path'] (stripped): '{status['output_path'].strip()}'")
-                    logger.info(f"DEBUG START - path starts with /volumes/ (case-insensitive): {status['output_path'].strip().lower().startswith('/volumes/')}")
-                
-                # Start the generation thread
-                start_generation_thread()
+                begin_generation_run(selected_industry, path_input, seed_input, scale_factor_input)
                 
                 section_style['display'] = 'block'
                 return False, f"Generating files for '{selected_industry}'...", "Stop", stop_style, False, loading_message, section_style, export_button_style, False
@@ -1031,20 +1587,9 @@ def control_generation(button_clicks, n_intervals, selected_language, selected_i
                 ], style={'padding': '12px'}), "Start", start_style, False, None, section_style, export_button_style, True
         else:  # Stop button was clicked
             print("\nStopping generation...")
-            # Disable button immediately and update UI
-            with status["lock"]:
-                status["running"] = False
-                status["thread"] = None
-                status["industry"] = None
-                status["iteration_count"] = 0
-                status["start_time"] = None
-                status["dlt_code"] = None
-                status["output_path"] = None
-            
-            # Stop the background thread
-            print("Stopping background thread...")
+            # Signals the background thread and resets state; the thread is
+            # joined outside the lock so other callbacks keep responding
             stop_generation_thread()
-            print("Background thread stopped and state reset")
             
             # Reset UI state
             section_style['display'] = 'none'
@@ -1054,46 +1599,54 @@ def control_generation(button_clicks, n_intervals, selected_language, selected_i
 
     elif trigger == 'interval-timer':
         with status["lock"]:
-            if not status["running"]:
-                # If generation is not running, disable the interval timer and reset state
-                stop_generation_thread()  # Ensure thread is stopped
-                return True, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, True
-            
-            # Check if DLT code needs to be generated
-            if status['dlt_code'] is None:
-                print("\nGenerating DLT code...")
-                try:
-                    schemas = load_all_schemas(status["industry"])
-                    dlt_codes = []
-                    for schema in schemas:
-                        table_type = schema.get("type", "fact")
-                        if table_type in ["dimension", "fact", "change_feed"]:
-                            table = schema["table"]
-                            output_path = os.path.join(status['output_path'], status["industry"], table)
-                            code = generate_dlt_references(schema, output_path, table_type)
-                            print(f"Generated code for table: {table} (type: {table_type})")
-                            dlt_codes.append({
-                                "table": table,
-                                "code": code
-                            })
-                    
-                    status['dlt_code'] = dlt_codes
-                    print(f"Stored DLT code: {status['dlt_code'] is not None}")
-                    section_style['display'] = 'block'
-                    export_button_style['display'] = 'block'
-                    return False, dash.no_update, "Stop", stop_style, False, create_dlt_code_display(dlt_codes, selected_language), section_style, export_button_style, False
-                except Exception as e:
-                    print(f"Error generating DLT code: {str(e)}")
-                    section_style['display'] = 'block'
-                    export_button_style['display'] = 'none'
-                    return False, dash.no_update, "Stop", stop_style, False, loading_message, section_style, export_button_style, False
-            
-            print("\nSubsequent iteration - using stored code")
-            section_style['display'] = 'block'
-            export_button_style['display'] = 'block'
-            if status['dlt_code'] is None:
+            running = status["running"]
+            industry = status["industry"]
+            output_base_path = status['output_path']
+            # The files on disk, not the dropdown, decide the read options
+            output_format = status["output_format"] or status["selected_output_format"] or DEFAULT_OUTPUT_FORMAT
+            stored_dlt_code = status['dlt_code']
+        
+        if not running:
+            # If generation is not running, disable the interval timer and reset state
+            stop_generation_thread()  # Ensure thread is stopped
+            return True, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, True
+        
+        # Check if DLT code needs to be generated
+        if stored_dlt_code is None:
+            print("\nGenerating DLT code...")
+            try:
+                schemas = load_all_schemas(industry)
+                dlt_codes = []
+                for schema in schemas:
+                    table_type = schema.get("type", "fact")
+                    if table_type in ["dimension", "fact", "change_feed"]:
+                        table = schema["table"]
+                        output_path = os.path.join(output_base_path, industry, table)
+                        code = generate_dlt_references(schema, output_path, table_type, output_format)
+                        print(f"Generated code for table: {table} (type: {table_type})")
+                        dlt_codes.append({
+                            "table": table,
+                            "code": code
+                        })
+                
+                with status["lock"]:
+                    # Keep the code only if the run it was generated for is still active
+                    if status["running"] and status["industry"] == industry:
+                        status['dlt_code'] = dlt_codes
+                print(f"Stored DLT code: {dlt_codes is not None}")
+                section_style['display'] = 'block'
+                export_button_style['display'] = 'block'
+                return False, dash.no_update, "Stop", stop_style, False, create_dlt_code_display(dlt_codes, selected_language), section_style, export_button_style, False
+            except Exception as e:
+                print(f"Error generating DLT code: {str(e)}")
+                section_style['display'] = 'block'
+                export_button_style['display'] = 'none'
                 return False, dash.no_update, "Stop", stop_style, False, loading_message, section_style, export_button_style, False
-            return False, dash.no_update, "Stop", stop_style, False, create_dlt_code_display(status['dlt_code'], selected_language), section_style, export_button_style, False
+        
+        print("\nSubsequent iteration - using stored code")
+        section_style['display'] = 'block'
+        export_button_style['display'] = 'block'
+        return False, dash.no_update, "Stop", stop_style, False, create_dlt_code_display(stored_dlt_code, selected_language), section_style, export_button_style, False
 
     raise dash.exceptions.PreventUpdate
 
@@ -1135,7 +1688,10 @@ def update_export_button(code_display):
      Output('path-input', 'value'),
      Output('dlt-output-dropdown', 'value'),
      Output('dlt-mode-dropdown', 'value'),
-     Output('duration-input', 'value')],
+     Output('output-format-dropdown', 'value'),
+     Output('duration-input', 'value'),
+     Output('seed-input', 'value'),
+     Output('scale-factor-input', 'value')],
     Input('initial-state-trigger', 'children'),
     prevent_initial_call=False  # Allow initial call
 )
@@ -1150,9 +1706,12 @@ def trigger_initial_state_check(_):
                 status["path_input"],
                 status["selected_dlt_output"],
                 status["selected_dlt_mode"],
-                status["duration_hours"]
+                status["selected_output_format"],
+                status["duration_hours"],
+                status["selected_seed"],
+                status["selected_scale_factor"]
             ]
-        return ['triggered', '', '', '', '', '', 4]  # Default duration to 4 hours
+        return ['triggered', '', '', '', '', '', DEFAULT_OUTPUT_FORMAT, 4, None, None]  # Default duration to 4 hours
 
 # Add UI state sync callback
 @app.callback(
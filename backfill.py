@@ -0,0 +1,131 @@
+"""Headless bulk generation, e.g. to pre-load a backfill before a streaming test.
+
+Runs the same iterations as the app (generate_files_for_industry) back to
+back, without the UI, the interval timer or any rate limiting, until
+--iterations have run or --total-gb / --total-rows have been written,
+whichever comes first. The first iteration clears the output directory and
+writes the dimension tables; every iteration writes the fact and change
+feed tables, and appends to dimensions with --dimension-growth-rows.
+
+Usage: python backfill.py --industry Retail --output /Volumes/main/raw/landing --total-gb 200 \\
+           --rows 5000000 --format parquet --workers 8 --upload-workers 8 --faker-pool-size 10000 --seed 42
+"""
+import argparse
+import os
+import threading
+import time
+
+from data_generators.change_feed_generator import CHANGE_FEED_MODES
+from data_generators.writers import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--industry", required=True, help="schema directory under schema/, e.g. Retail")
+    parser.add_argument("--output", required=True, help="local directory or /Volumes/... path")
+    parser.add_argument("--format", choices=list(OUTPUT_FORMATS), default=DEFAULT_OUTPUT_FORMAT)
+    parser.add_argument("--iterations", type=int, help="stop after this many iterations")
+    parser.add_argument("--total-gb", type=float, help="stop once this much data has been written")
+    parser.add_argument("--total-rows", type=int, help="stop once this many rows have been written")
+    parser.add_argument("--rows", type=int, help="rows per fact and change feed table per iteration (default: the schema's num_rows times the scale factor)")
+    parser.add_argument("--dimension-growth-rows", type=int,
+                        help="rows appended to every dimension per iteration after the first (STREAMFORGE_DIMENSION_GROWTH_ROWS)")
+    parser.add_argument("--scale-factor", type=float, help="multiply every table's num_rows, dimensions included (STREAMFORGE_SCALE_FACTOR)")
+    parser.add_argument("--workers", type=int, help="generation worker processes (STREAMFORGE_GENERATION_WORKERS)")
+    parser.add_argument("--upload-workers", type=int, help="volume upload threads (STREAMFORGE_UPLOAD_WORKERS)")
+    parser.add_argument("--faker-pool-size", type=int, help="sample Faker columns from pools of this size (STREAMFORGE_FAKER_POOL_SIZE)")
+    parser.add_argument("--faker-pool-dir", help="save Faker pools here and memory-map them in later runs (STREAMFORGE_FAKER_POOL_DIR)")
+    parser.add_argument("--change-feed-mode", choices=list(CHANGE_FEED_MODES),
+                        help="mode of change feeds whose schema sets none (STREAMFORGE_CHANGE_FEED_MODE)")
+    parser.add_argument("--chunk-rows", type=int, help="rows generated and written per chunk (STREAMFORGE_CHUNK_ROWS)")
+    parser.add_argument("--shard-rows", type=int, help="split bigger tables into row-range shards across workers (STREAMFORGE_SHARD_ROWS)")
+    parser.add_argument("--worker-urls", help="comma-separated generation worker URLs, see worker.py (STREAMFORGE_WORKER_URLS)")
+    parser.add_argument("--seed", type=int, help="run seed; a new one is drawn and logged if omitted")
+    parser.add_argument("--reference-time", help="ISO upper bound of unranged datetime columns (STREAMFORGE_REFERENCE_TIME)")
+    args = parser.parse_args()
+
+    if not (args.iterations or args.total_gb or args.total_rows):
+        parser.error("set at least one of --iterations, --total-gb and --total-rows")
+    if args.scale_factor is not None and args.scale_factor <= 0:
+        parser.error("--scale-factor must be positive")
+    if args.seed is not None and args.seed < 0:
+        parser.error("--seed must be non-negative")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    # The app reads these settings from the environment when it is imported
+    for name, value in (
+        ("STREAMFORGE_GENERATION_WORKERS", args.workers),
+        ("STREAMFORGE_UPLOAD_WORKERS", args.upload_workers),
+        ("STREAMFORGE_CHUNK_ROWS", args.chunk_rows),
+        ("STREAMFORGE_SHARD_ROWS", args.shard_rows),
+        ("STREAMFORGE_WORKER_URLS", args.worker_urls),
+        ("STREAMFORGE_FAKER_POOL_SIZE", args.faker_pool_size),
+        ("STREAMFORGE_FAKER_POOL_DIR", args.faker_pool_dir),
+        ("STREAMFORGE_CHANGE_FEED_MODE", args.change_feed_mode),
+        ("STREAMFORGE_REFERENCE_TIME", args.reference_time),
+        ("STREAMFORGE_SCALE_FACTOR", args.scale_factor),
+        ("STREAMFORGE_DIMENSION_GROWTH_ROWS", args.dimension_growth_rows),
+    ):
+        if value is not None:
+            os.environ[name] = str(value)
+    import app
+
+    if args.industry not in app.list_industries():
+        raise SystemExit(f"Unknown industry {args.industry}; choose from {', '.join(sorted(app.list_industries()))}")
+
+    stop_event = threading.Event()
+    with app.status["lock"]:
+        app.status.update(
+            running=True,
+            industry=args.industry,
+            iteration_count=0,
+            start_time=time.time(),
+            output_path=args.output.strip(),
+            selected_output_format=args.format,
+            seed=args.seed,
+            scale_factor=app.SCALE_FACTOR,
+            reference_time=None,
+            stop_event=stop_event,
+            progress={},
+        )
+
+    target_bytes = args.total_gb * 1024 ** 3 if args.total_gb else None
+    rows = size = iterations = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            results = app.generate_files_for_industry(args.industry, stop_event=stop_event, num_rows=args.rows)
+            iterations += 1
+            rows += sum(r["rows"] for r in results)
+            size += sum(r["bytes"] for r in results)
+            elapsed = time.perf_counter() - start
+            app.logger.info(
+                f"Backfill: {iterations} iterations, {rows:,} rows, {size / 1024 ** 3:.2f} GB in {elapsed:.1f}s "
+                f"({rows / elapsed:,.0f} rows/s, {size / 1024 ** 2 / elapsed:.1f} MB/s)"
+            )
+            if (
+                (args.iterations and iterations >= args.iterations)
+                or (target_bytes and size >= target_bytes)
+                or (args.total_rows and rows >= args.total_rows)
+            ):
+                break
+    except KeyboardInterrupt:
+        app.logger.info("Backfill interrupted")
+        stop_event.set()
+        raise SystemExit(130)
+    finally:
+        with app.status["lock"]:
+            app.status["running"] = False
+        app.shutdown_generation_executor()
+        app.shutdown_remote_executor()
+        app.shutdown_upload_pool()
+
+    app.logger.info(f"Backfill of {args.industry} to {args.output} complete (seed {app.status['seed']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Change feed history generation, per-key loop versus columnar.
+
+Generates the history of --keys keys for every change feed table, once with
+the original loop (dict rows built per key, see legacy_history below) and
+once with ChangeFeedGenerator's columnar engine, and prints both times. The
+loop is slow, so it is timed on --legacy-keys keys and scaled up.
+
+Usage: python benchmarks/change_feed.py [--keys 1000000] [--legacy-keys 20000] [--industry Finance]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from data_generators import ChangeFeedGenerator
+from data_generators.schema_registry import load_schema_directory
+
+SCHEMA_BASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema")
+
+
+def legacy_history(generator, num_keys):
+    """The per-key loop _generate_chunk used before: one dict per event, timestamps per key."""
+    rules, plans = generator.rules, generator.column_plans
+    all_rows = []
+    for customer_id in range(1, num_keys + 1):
+        row = {'customer_id': customer_id, 'operation': 'INSERT'}
+        for col, plan in plans.items():
+            if col not in ['operation', 'customer_id', 'change_timestamp']:
+                row[col] = plan.value()
+
+        num_updates = random.randint(0, rules['operation_distribution']['UPDATE'])
+        will_delete = random.random() < rules['operation_distribution']['DELETE']
+        timestamps = []
+        current_date = generator.start_date
+        for _ in range(1 + num_updates + will_delete):
+            current_date += timedelta(days=random.randint(
+                rules['time_between_changes']['min'], rules['time_between_changes']['max']
+            ))
+            timestamps.append(current_date)
+
+        row['change_timestamp'] = timestamps[0].isoformat()
+        all_rows.append(row)
+        for i in range(num_updates):
+            row = dict(row, operation='UPDATE', change_timestamp=timestamps[i + 1].isoformat())
+            for field in rules['updatable_fields']:
+                if field in plans:
+                    row[field] = plans[field].value()
+            all_rows.append(row)
+        if will_delete:
+            row = dict(row, operation='DELETE', change_timestamp=timestamps[-1].isoformat())
+            for field in rules['delete_null_fields']:
+                row[field] = None
+            all_rows.append(row)
+    return pd.DataFrame(all_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--legacy-keys", type=int, default=20_000, help="keys timed with the per-key loop")
+    parser.add_argument("--industry", action="append", help="limit to one or more industries")
+    args = parser.parse_args()
+
+    industries = args.industry or sorted(
+        d for d in os.listdir(SCHEMA_BASE_PATH) if os.path.isdir(os.path.join(SCHEMA_BASE_PATH, d))
+    )
+    output_dir = tempfile.mkdtemp(prefix="streamforge_bench_")
+
+    print(f"{'table':<40} {'rows':>10} {'loop s':>10} {'columnar s':>11} {'speedup':>8}")
+    for industry in industries:
+        for schema_path, schema in load_schema_directory(os.path.join(SCHEMA_BASE_PATH, industry)).items():
+            if schema.get("type", "fact") != "change_feed":
+                continue
+            generator = ChangeFeedGenerator(schema_path, output_dir, seed=0)
+
+            start = time.perf_counter()
+            legacy_history(generator, args.legacy_keys)
+            loop = (time.perf_counter() - start) * args.keys / args.legacy_keys
+
+            start = time.perf_counter()
+            frame = generator._generate_chunk(0, args.keys)
+            columnar = time.perf_counter() - start
+
+            name = f"{industry}/{schema['table']}"
+            print(f"{name:<40} {len(frame):>10,} {loop:>10.2f} {columnar:>11.2f} {loop / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
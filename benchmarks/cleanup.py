@@ -0,0 +1,72 @@
+"""Clearing a volume directory full of batch files, serially versus concurrently.
+
+Builds a tree shaped like a long run's output (tables x files) in the local
+Files API stand-in (see files_api.py), then deletes it with the original
+one-call-at-a-time walk and with delete_remote_tree at the given
+concurrency. Prints both wall times.
+
+Usage: python benchmarks/cleanup.py [--tables 8] [--files 250] [--workers 16] [--latency 0.01]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from files_api import LocalWorkspace
+from data_generators.cleanup import delete_remote_tree
+
+DIRECTORY = "/Volumes/bench/streamforge/data/Retail"
+
+
+def populate(workspace, tables, files):
+    latency, workspace.files.latency = workspace.files.latency, 0.0
+    for table in range(tables):
+        for i in range(files):
+            workspace.files.upload(f"{DIRECTORY}/table_{table}/data_{i:06d}.csv", io.BytesIO(b"id\n1\n"), overwrite=True)
+    workspace.files.latency = latency
+
+
+def delete_serially(workspace, dir_path):
+    """The walk _check_directory_empty used before: one Files API call at a time."""
+    contents = list(workspace.files.list_directory_contents(dir_path))
+    for item in contents:
+        if item.is_directory:
+            delete_serially(workspace, item.path)
+        else:
+            workspace.files.delete(item.path)
+    workspace.files.delete_directory(dir_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=8)
+    parser.add_argument("--files", type=int, default=250, help="files per table")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds added to every Files API call")
+    args = parser.parse_args()
+
+    workspace = LocalWorkspace(tempfile.mkdtemp(prefix="streamforge_files_"), latency=args.latency)
+    total = args.tables * args.files
+
+    populate(workspace, args.tables, args.files)
+    start = time.perf_counter()
+    delete_serially(workspace, DIRECTORY)
+    serial = time.perf_counter() - start
+
+    populate(workspace, args.tables, args.files)
+    start = time.perf_counter()
+    delete_remote_tree(DIRECTORY, workspace, args.workers)
+    concurrent = time.perf_counter() - start
+
+    print(f"{total} files in {args.tables} directories, {args.latency * 1000:.0f} ms per call")
+    print(f"serial:                {serial:8.2f}s")
+    print(f"{args.workers:>3} concurrent deletes: {concurrent:8.2f}s  ({serial / concurrent:.1f}x)")
+    workspace.files.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Per-row generation cost before and after compiling column plans.
+
+Runs every table in schema/<Industry> through three paths and prints the
+average cost of one row in microseconds:
+
+  dispatch  - dispatch_row, the generators' per-cell code before column
+              plans (schema re-inspected on every cell)
+  plan      - ColumnPlan.value() per cell (callables resolved once)
+  columnar  - ColumnPlan.column() for the whole batch
+
+Usage: python benchmarks/column_plans.py [--rows 2000] [--industry Retail]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml
+from data_generators import DimensionGenerator, FactGenerator, ChangeFeedGenerator
+
+SCHEMA_BASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema")
+
+
+def build_generator(schema_path, schema, output_dir, dimension_key_ranges):
+    table_type = schema.get("type", "fact")
+    if table_type == "dimension":
+        return DimensionGenerator(schema_path, output_dir)
+    if table_type == "fact":
+        return FactGenerator(schema_path, output_dir, dimension_key_ranges)
+    return ChangeFeedGenerator(schema_path, output_dir)
+
+
+# The per-cell generators before column plans, copied from the baseline
+# BaseGenerator, FactGenerator and ChangeFeedGenerator methods (``self`` is
+# the generator, whose Faker instance they use)
+
+def base_generate_value(self, col, col_def):
+    """Base method for generating values based on data type."""
+    # Check for null probability first
+    if isinstance(col_def, dict):
+        null_prob = col_def.get('null_probability', 0.0)
+        if random.random() < null_prob:
+            return None
+        
+        dtype = col_def.get('type', 'string')
+        format_spec = col_def.get('format')
+    else:
+        # Handle simple type definitions (e.g., "string", "int", etc.)
+        dtype = str(col_def).lower()  # Convert to lowercase string
+        format_spec = None
+        
+    col_lower = col.lower()
+    
+    # Handle basic data types
+    if dtype == 'int':
+        return random.randint(1, 9999)
+    elif dtype == 'float':
+        return round(random.uniform(0, 1000), 2)
+    elif dtype == 'bool':
+        return random.choice([True, False])
+    elif dtype == 'string':
+        if format_spec:
+            if '|' in format_spec:
+                # Handle pipe-separated formats (e.g., "RES|COM|IND")
+                return random.choice(format_spec.split('|'))
+            elif '#' in format_spec:
+                # Handle formats with hash symbols for random digits
+                result = format_spec
+                while '#' in result:
+                    result = result.replace('#', str(random.randint(0, 9)), 1)
+                return result
+            elif '?' in format_spec:
+                # Handle formats with question marks for random letters
+                result = format_spec
+                while '?' in result:
+                    result = result.replace('?', random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), 1)
+                return result
+            else:
+                # Simple catch-all: return format as-is
+                return format_spec
+        elif 'manufacturer' in col_lower or 'company' in col_lower:
+            return self.fake.company()
+        elif 'name' in col_lower:
+            return self.fake.name()
+        elif 'email' in col_lower:
+            return self.fake.email()
+        elif 'address' in col_lower:
+            return self.fake.address()
+        elif 'city' in col_lower:
+            return self.fake.city()
+        elif 'state' in col_lower:
+            return self.fake.state()
+        elif 'zip' in col_lower:
+            return self.fake.zipcode()
+        elif 'country' in col_lower:
+            return self.fake.country()
+        elif ('contact' in col_lower or 'phone' in col_lower) and 'number' in col_lower:
+            return f"({self.fake.random_number(digits=3)}) {self.fake.random_number(digits=3)}-{self.fake.random_number(digits=4)}"
+        else:
+            return self.fake.word().title()
+    elif dtype == 'datetime':
+        return self.fake.date_time().isoformat()
+        
+    error_msg = f"Unsupported data type: {dtype}"
+    if format_spec:
+        error_msg += f" with format: {format_spec}"
+    raise ValueError(error_msg)
+
+
+def fact_generate_value(self, col, col_def):
+    """Generate a value based on column definition."""
+    # Check if there are data quality rules for this column
+    if 'data_quality_rules' in self.schema and col in self.schema['data_quality_rules']:
+        rules = self.schema['data_quality_rules'][col]
+        min_value = rules.get('min_value')
+        max_value = rules.get('max_value')
+        anomaly_percentage = rules.get('anomaly_percentage', 0)
+        
+        # Randomly decide if this value should be an anomaly
+        if random.random() < anomaly_percentage:
+            # Generate an anomalous value outside the normal range
+            if random.random() < 0.5:  # 50% chance of being below min
+                value = min_value - random.uniform(0.1, 0.3)  # 10-30% below min
+            else:  # 50% chance of being above max
+                value = max_value + random.uniform(0.1, 0.3)  # 10-30% above max
+        else:
+            # Generate a normal value within the range
+            value = random.uniform(min_value, max_value)
+        
+        # Round to 2 decimal places for float values
+        if isinstance(value, float):
+            value = round(value, 2)
+            
+        return value
+        
+    # Use base implementation if no quality rules
+    return base_generate_value(self, col, col_def)
+
+
+def fact_generate_value_with_quality_rules(self, col, col_def):
+    """Generate a value considering data quality rules if they exist."""
+    value = fact_generate_value(self, col, col_def)
+    
+    # Check if there are data quality rules for this column
+    if 'data_quality_rules' in self.schema and col in self.schema['data_quality_rules']:
+        rules = self.schema['data_quality_rules'][col]
+        min_value = rules.get('min_value')
+        max_value = rules.get('max_value')
+        anomaly_percentage = rules.get('anomaly_percentage', 0)
+        
+        # Randomly decide if this value should be an anomaly
+        if random.random() < anomaly_percentage:
+            # Generate an anomalous value outside the normal range
+            if random.random() < 0.5:  # 50% chance of being below min
+                value = min_value - random.uniform(0.1, 0.3)  # 10-30% below min
+            else:  # 50% chance of being above max
+                value = max_value + random.uniform(0.1, 0.3)  # 10-30% above max
+        else:
+            # Generate a normal value within the range
+            value = random.uniform(min_value, max_value)
+        
+        # Round to 2 decimal places for float values
+        if isinstance(value, float):
+            value = round(value, 2)
+    
+    return value
+
+
+def change_feed_generate_value(self, col, col_def):
+    """Generate a value based on column name and data type."""
+    if isinstance(col_def, str):
+        dtype = col_def
+    else:
+        dtype = col_def.get('type', 'string')
+        
+    # Special handling for datetime in change feeds
+    if dtype == 'datetime':
+        # Convert string dates to datetime objects for Faker
+        start_date = datetime.strptime(self.rules['time_range']['start_date'], '%Y-%m-%d')
+        end_date = datetime.strptime(self.rules['time_range']['end_date'], '%Y-%m-%d')
+        return self.fake.date_time_between(
+            start_date=start_date,
+            end_date=end_date
+        ).isoformat()
+        
+    # Use base implementation for all other types
+    return base_generate_value(self, col, col_def)
+
+
+def dispatch_row(self, i):
+    """One row the way the baseline generate_data loops built it, for row number ``i``."""
+    table_type = self.schema.get("type", "fact")
+    row = {}
+    for col, col_def in self.schema['columns'].items():
+        if table_type == "dimension":
+            if col.endswith('_id'):
+                row[col] = i
+            else:
+                row[col] = base_generate_value(self, col, col_def)
+        elif table_type == "fact":
+            if col in self.dimension_key_ranges:
+                # Use dimension key ranges for foreign keys
+                row[col] = self.fake.random_int(min=1, max=self.dimension_key_ranges[col])
+            elif 'data_quality_rules' in self.schema and col in self.schema['data_quality_rules']:
+                # Use quality rules if they exist for this column
+                row[col] = fact_generate_value_with_quality_rules(self, col, col_def)
+            else:
+                # Use standard value generation if no quality rules
+                row[col] = fact_generate_value(self, col, col_def)
+        elif col not in ['operation', 'customer_id', 'change_timestamp']:
+            row[col] = change_feed_generate_value(self, col, col_def)
+    return row
+
+
+def time_per_row(fn, num_rows):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / num_rows * 1e6
+
+
+def bench_table(generator, num_rows):
+    plans = generator.column_plans
+    random.seed(0)
+
+    def dispatch():
+        for i in range(1, num_rows + 1):
+            dispatch_row(generator, i)
+
+    def plan():
+        for _ in range(num_rows):
+            {col: p.value() for col, p in plans.items()}
+
+    def columnar():
+        {col: p.column(num_rows) for col, p in plans.items()}
+
+    return time_per_row(dispatch, num_rows), time_per_row(plan, num_rows), time_per_row(columnar, num_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="rows generated per table and path")
+    parser.add_argument("--industry", action="append", help="limit to one or more industries")
+    args = parser.parse_args()
+
+    industries = args.industry or sorted(
+        d for d in os.listdir(SCHEMA_BASE_PATH) if os.path.isdir(os.path.join(SCHEMA_BASE_PATH, d))
+    )
+    output_dir = tempfile.mkdtemp(prefix="streamforge_bench_")
+
+    print(f"{'table':<40} {'type':<12} {'dispatch us':>12} {'plan us':>10} {'columnar us':>12} {'speedup':>8}")
+    for industry in industries:
+        industry_path = os.path.join(SCHEMA_BASE_PATH, industry)
+        schemas = {}
+        for file in sorted(os.listdir(industry_path)):
+            if file.endswith((".yml", ".yaml")):
+                with open(os.path.join(industry_path, file)) as f:
+                    schemas[os.path.join(industry_path, file)] = yaml.safe_load(f)
+
+        dimension_key_ranges = {}
+        for schema in schemas.values():
+            if schema.get("type", "fact") == "dimension":
+                for col in schema["columns"]:
+                    if col.endswith("_id"):
+                        dimension_key_ranges[col] = schema.get("num_rows", 10)
+
+        for schema_path, schema in schemas.items():
+            generator = build_generator(schema_path, schema, output_dir, dimension_key_ranges)
+            dispatch, plan, columnar = bench_table(generator, args.rows)
+            name = f"{industry}/{schema['table']}"
+            print(f"{name:<40} {schema.get('type', 'fact'):<12} {dispatch:>12.2f} {plan:>10.2f} {columnar:>12.2f} {dispatch / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Local stand-in for the Databricks Files API.
+
+LocalWorkspace maps /Volumes/... paths onto a local directory and mimics the
+parts of ``WorkspaceClient.files`` the generators use: upload, delete,
+list_directory_contents and delete_directory. Per-call latency, upload
+bandwidth and a transient failure rate can be configured, so volume code
+paths can be exercised and timed without a workspace:
+
+    from data_generators.volumes import set_workspace_client
+    set_workspace_client(LocalWorkspace(root, latency=0.05, failure_rate=0.1))
+"""
+import os
+import random
+import shutil
+import threading
+import time
+
+
+class TemporarilyUnavailable(Exception):
+    """Same name as the SDK's 503 error, so it is classified as transient."""
+
+
+class DirectoryEntry:
+    def __init__(self, path, is_directory, file_size=None):
+        self.path = path
+        self.is_directory = is_directory
+        self.file_size = file_size
+
+
+class LocalFiles:
+    def __init__(self, root, latency=0.0, bandwidth=None, failure_rate=0.0, seed=None):
+        self.root = root
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = {'upload': 0, 'delete': 0, 'list_directory_contents': 0, 'delete_directory': 0, 'failures': 0}
+
+    def _local(self, path):
+        return os.path.join(self.root, path.lstrip('/'))
+
+    def _remote(self, local_path):
+        return '/' + os.path.relpath(local_path, self.root).replace(os.sep, '/')
+
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] += 1
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.calls['failures'] += 1
+        time.sleep(self.latency)
+        if fail:
+            raise TemporarilyUnavailable(f"Simulated {name} failure")
+
+    def upload(self, file_path, contents, overwrite=False):
+        self._call('upload')
+        local_path = self._local(file_path)
+        if os.path.exists(local_path) and not overwrite:
+            raise FileExistsError(file_path)
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        size = 0
+        with open(local_path, 'wb') as f:
+            while True:
+                chunk = contents.read(1024 * 1024)
+                if not chunk:
+                    break
+                f.write(chunk)
+                size += len(chunk)
+        if self.bandwidth:
+            time.sleep(size / self.bandwidth)
+
+    def delete(self, file_path):
+        self._call('delete')
+        try:
+            os.remove(self._local(file_path))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Not found: {file_path}")
+
+    def list_directory_contents(self, directory_path):
+        self._call('list_directory_contents')
+        local_path = self._local(directory_path)
+        if not os.path.isdir(local_path):
+            raise FileNotFoundError(f"Not found: {directory_path}")
+        for entry in os.scandir(local_path):
+            is_directory = entry.is_dir()
+            yield DirectoryEntry(self._remote(entry.path), is_directory, None if is_directory else entry.stat().st_size)
+
+    def delete_directory(self, directory_path):
+        self._call('delete_directory')
+        local_path = self._local(directory_path)
+        if not os.path.isdir(local_path):
+            raise FileNotFoundError(f"Not found: {directory_path}")
+        os.rmdir(local_path)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class LocalWorkspace:
+    """Minimal WorkspaceClient replacement exposing ``files``."""
+
+    def __init__(self, root, **options):
+        self.files = LocalFiles(root, **options)
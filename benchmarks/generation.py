@@ -0,0 +1,224 @@
+"""Generation throughput of every shipped schema at several table sizes.
+
+Runs each table of schema/<Industry> through its generator (dimension, fact
+or change feed) at every --rows scale and writes it to a local file in each
+--format. Every case runs in a fresh process so peak RSS is its own. Per case
+it records:
+
+  rows/s, bytes/s   - output rows and bytes over the whole run
+  generate_s        - building the DataFrame chunks
+  serialize_s       - encoding them in the output format
+  write_s           - time spent in file writes
+  peak_rss_mb       - peak resident memory (baseline_rss_mb: before generating)
+  columns           - nanoseconds per row for every column plan
+
+Results are printed as a table and saved as JSON (--output). Pass a saved
+file as --compare to print the rows/s ratio of each case against it, e.g.
+between two versions of the generators.
+
+Usage: python benchmarks/generation.py [--rows 1e3 1e4 1e5] [--industry Retail] [--type fact]
+                                       [--format csv] [--output generation.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_generators import ChangeFeedGenerator, DimensionGenerator, FactGenerator
+from data_generators.parallel import _timed
+from data_generators.schema_registry import load_schema_directory
+
+SCHEMA_BASE_PATH = os.path.join(ROOT, "schema")
+TABLE_TYPES = ("dimension", "fact", "change_feed")
+# Rows drawn per column when timing column plans on their own
+COLUMN_SAMPLE_ROWS = 100_000
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def dimension_key_ranges(schemas):
+    ranges = {}
+    for schema in schemas.values():
+        if schema.get("type", "fact") == "dimension":
+            for col in schema["columns"]:
+                if col.endswith("_id"):
+                    ranges[col] = schema.get("num_rows", 10)
+    return ranges
+
+
+def run_case(case):
+    """Generate and write one table at one scale. Runs in its own process."""
+    import logging
+    logging.disable(logging.INFO)
+
+    options = {
+        "seed": 42,
+        "num_rows": case["rows"],
+        "output_format": case["format"],
+        "faker_pool_size": case["faker_pool_size"],
+    }
+    output_dir = tempfile.mkdtemp(prefix="streamforge_bench_")
+    if case["type"] == "dimension":
+        generator = DimensionGenerator(case["schema_path"], output_dir, **options)
+    elif case["type"] == "fact":
+        generator = FactGenerator(case["schema_path"], output_dir, case["key_ranges"], **options)
+    else:
+        generator = ChangeFeedGenerator(case["schema_path"], output_dir, **options)
+    generator.column_plans  # compile outside the timed region
+    baseline_rss = peak_rss_mb()
+
+    stats = {"rows": 0, "generate_seconds": 0.0}
+    path = os.path.join(output_dir, "data")
+    start = time.perf_counter()
+    with open(path, "wb") as f:
+        # _write_batches times the file writes through writers.CountingWriter
+        generator._write_batches(_timed(generator.generate_batches(case["chunk_rows"]), stats), f)
+    total = time.perf_counter() - start
+    os.remove(path)
+    rss = peak_rss_mb()
+
+    columns = {}
+    sample = min(case["rows"], COLUMN_SAMPLE_ROWS)
+    for col in generator.column_plans:
+        col_start = time.perf_counter()
+        generator._generate_column(col, sample)
+        columns[col] = round((time.perf_counter() - col_start) / sample * 1e9, 1)
+
+    return {
+        "industry": case["industry"],
+        "table": case["table"],
+        "type": case["type"],
+        "format": case["format"],
+        "num_rows": case["rows"],
+        "rows": stats["rows"],
+        "bytes": generator.bytes_written,
+        "total_s": round(total, 4),
+        "generate_s": round(stats["generate_seconds"], 4),
+        "serialize_s": round(total - stats["generate_seconds"] - generator.write_seconds, 4),
+        "write_s": round(generator.write_seconds, 4),
+        "rows_per_s": round(stats["rows"] / total, 1),
+        "bytes_per_s": round(generator.bytes_written / total, 1),
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(rss, 1),
+        "columns": columns,
+    }
+
+
+def build_cases(args):
+    industries = args.industry or sorted(
+        d for d in os.listdir(SCHEMA_BASE_PATH) if os.path.isdir(os.path.join(SCHEMA_BASE_PATH, d))
+    )
+    cases = []
+    for industry in industries:
+        schemas = load_schema_directory(os.path.join(SCHEMA_BASE_PATH, industry))
+        key_ranges = dimension_key_ranges(schemas)
+        for schema_path, schema in schemas.items():
+            table_type = schema.get("type", "fact")
+            if args.type and table_type not in args.type:
+                continue
+            for rows in args.rows:
+                for output_format in args.format:
+                    cases.append({
+                        "industry": industry,
+                        "table": schema["table"],
+                        "type": table_type,
+                        "schema_path": schema_path,
+                        "key_ranges": key_ranges,
+                        "rows": rows,
+                        "format": output_format,
+                        "chunk_rows": args.chunk_rows,
+                        "faker_pool_size": args.faker_pool_size,
+                    })
+    return cases
+
+
+def case_key(result):
+    return result["industry"], result["table"], result["num_rows"], result["format"]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(args):
+    import numpy
+    import pandas
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "chunk_rows": args.chunk_rows,
+        "faker_pool_size": args.faker_pool_size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", type=lambda v: int(float(v)), default=[1_000, 10_000, 100_000],
+                        help="num_rows scales (keys for change feeds), e.g. 1e3 1e5 1e7")
+    parser.add_argument("--industry", action="append", help="limit to one or more industries")
+    parser.add_argument("--type", action="append", choices=TABLE_TYPES, help="limit to one or more table types")
+    parser.add_argument("--format", action="append", help="output formats (default: csv)")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--faker-pool-size", type=int, help="sample Faker columns from pools of this size")
+    parser.add_argument("--output", default="generation.json", help="JSON file the results are written to")
+    parser.add_argument("--compare", help="earlier results file to compare rows/s against")
+    args = parser.parse_args()
+    args.format = args.format or ["csv"]
+
+    cases = build_cases(args)
+    context = multiprocessing.get_context("spawn")
+    results = []
+    print(f"{'table':<40} {'format':<9} {'num_rows':>10} {'rows/s':>12} {'MB/s':>8} "
+          f"{'gen s':>8} {'ser s':>8} {'write s':>8} {'RSS MB':>8}  slowest column")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for result in pool.imap(run_case, cases):
+            results.append(result)
+            slowest = max(result["columns"].items(), key=lambda item: item[1])
+            name = f"{result['industry']}/{result['table']}"
+            print(f"{name:<40} {result['format']:<9} {result['num_rows']:>10,} {result['rows_per_s']:>12,.0f} "
+                  f"{result['bytes_per_s'] / 1024 / 1024:>8.1f} {result['generate_s']:>8.2f} {result['serialize_s']:>8.2f} "
+                  f"{result['write_s']:>8.2f} {result['peak_rss_mb']:>8.0f}  {slowest[0]} ({slowest[1]:.0f} ns/row)")
+
+    with open(args.output, "w") as f:
+        json.dump({"meta": metadata(args), "results": results}, f, indent=2)
+    print(f"Saved {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        previous = {case_key(r): r for r in baseline["results"]}
+        print(f"\nrows/s against {args.compare} (revision {baseline['meta'].get('revision')})")
+        for result in results:
+            before = previous.get(case_key(result))
+            if before is None:
+                continue
+            name = f"{result['industry']}/{result['table']}"
+            print(f"{name:<40} {result['format']:<9} {result['num_rows']:>10,} {result['rows_per_s'] / before['rows_per_s']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
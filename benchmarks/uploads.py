@@ -0,0 +1,109 @@
+"""One iteration of volume uploads, one table at a time versus through an UploadPool.
+
+Every table of an industry is generated with is_local=False and uploaded to a
+local stand-in for the Files API (see files_api.py) that adds per-call
+latency, limited bandwidth and random transient failures. Prints wall time
+for each mode plus the pool's retry and back-pressure counters, and exits
+with an error if a streamed table's serialization and upload times add up
+to more than its save time.
+
+Usage: python benchmarks/uploads.py [--industry Retail] [--workers 4] [--latency 0.2]
+                                    [--bandwidth-mb 50] [--failure-rate 0.1]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml
+from files_api import LocalWorkspace
+from data_generators.parallel import generate_table
+from data_generators.upload_pool import UploadPool
+from data_generators.volumes import set_workspace_client
+
+SCHEMA_BASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema")
+
+
+def build_tasks(industry, output_format):
+    industry_path = os.path.join(SCHEMA_BASE_PATH, industry)
+    schemas = {}
+    for file in sorted(os.listdir(industry_path)):
+        if file.endswith((".yml", ".yaml")):
+            with open(os.path.join(industry_path, file)) as f:
+                schemas[os.path.join(industry_path, file)] = yaml.safe_load(f)
+
+    dimension_key_ranges = {}
+    for schema in schemas.values():
+        if schema.get("type", "fact") == "dimension":
+            for col in schema["columns"]:
+                if col.endswith("_id"):
+                    dimension_key_ranges[col] = schema.get("num_rows", 10)
+
+    return [{
+        "table": schema["table"],
+        "table_type": schema.get("type", "fact"),
+        "schema_path": schema_path,
+        "output_path": "/Volumes/bench/streamforge/data",
+        "is_local": False,
+        "dimension_key_ranges": dimension_key_ranges,
+        "seed": 42,
+        "chunk_rows": None,
+        "output_format": output_format,
+    } for schema_path, schema in schemas.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--industry", default="Retail")
+    parser.add_argument("--format", default="csv", help="output format")
+    parser.add_argument("--workers", type=int, default=4, help="upload pool threads")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds added to every Files API call")
+    parser.add_argument("--bandwidth-mb", type=float, default=50, help="simulated upload bandwidth in MB/s")
+    parser.add_argument("--failure-rate", type=float, default=0.1, help="fraction of calls failing transiently")
+    args = parser.parse_args()
+
+    workspace = LocalWorkspace(
+        tempfile.mkdtemp(prefix="streamforge_files_"),
+        latency=args.latency,
+        bandwidth=args.bandwidth_mb * 1024 * 1024,
+        failure_rate=args.failure_rate,
+        seed=0,
+    )
+    set_workspace_client(workspace)
+    tasks = build_tasks(args.industry, args.format)
+
+    # Without a pool the streamed upload of a large table is attempted once, so
+    # the sequential baseline runs without injected failures
+    workspace.files.failure_rate = 0.0
+    start = time.perf_counter()
+    results = [generate_table(task) for task in tasks]
+    sequential = time.perf_counter() - start
+    for result in results:
+        # A streamed upload's serialization and upload must not count the same seconds twice
+        if result["serialize_seconds"] < 0 or result["serialize_seconds"] + result["upload_seconds"] > result["save_seconds"] + 1e-6:
+            raise SystemExit(
+                f"{result['table']}: serialize {result['serialize_seconds']:.3f}s + upload {result['upload_seconds']:.3f}s "
+                f"exceed the save time of {result['save_seconds']:.3f}s"
+            )
+
+    workspace.files.failure_rate = args.failure_rate
+    pool = UploadPool(workers=args.workers, backoff=0.1, workspace=workspace)
+    start = time.perf_counter()
+    for task in tasks:
+        generate_table(task, pool)
+    uploads = pool.drain()
+    pooled = time.perf_counter() - start
+    pool.shutdown()
+
+    print(f"{len(tasks)} tables, {sum(u['bytes'] for u in uploads) / 1e6:.1f} MB per iteration")
+    print(f"sequential uploads:         {sequential:8.2f}s")
+    print(f"pool of {args.workers} upload threads:  {pooled:8.2f}s  "
+          f"({sum(u['retries'] for u in uploads)} retries, generation blocked {pool.blocked_seconds:.2f}s)")
+    workspace.files.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,36 @@ from abc import ABC, abstractmethod
 import pandas as pd
 import os
 from datetime import datetime
-import tempfile
 import logging
 import random
+import time
+import numpy as np
+from faker import Faker
+from .column_plan import ColumnPlan
+from .templates import compile_format
+from .pools import FAKER_PROVIDERS, get_pool
+from .writers import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS, CountingWriter, write_batches
+from .volumes import get_workspace_client, upload_stream
+from .schema_registry import load_schema, scaled_num_rows
+from .cleanup import CLEANUP_WORKERS, cleanup_local_in_background, cleanup_remote_in_background, delete_remote_tree, is_not_found
 
 logger = logging.getLogger(__name__)
 
 class BaseGenerator(ABC):
-    def __init__(self, schema_path, output_base_path, is_local=True):
+    def __init__(self, schema_path, output_base_path, is_local=True, faker_pool_size=None, faker_pool_dir=None, seed=None,
+                 output_format=DEFAULT_OUTPUT_FORMAT, upload_pool=None, num_rows=None, reference_time=None, shard=None,
+                 scale_factor=1, row_offset=0):
         self.schema_path = schema_path
         self.output_base_path = output_base_path.strip()
         self._is_local = is_local
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.output_format = output_format
+        # Pooled mode: Faker-backed string columns sample from precomputed value pools
+        self.faker_pool_size = faker_pool_size
+        self.faker_pool_dir = faker_pool_dir
+        # Optional UploadPool: volume uploads are queued instead of awaited
+        self.upload_pool = upload_pool
         
         # Debug logging
         logger.info(f"DEBUG - BaseGenerator initialized with:")
@@ -22,34 +41,77 @@ class BaseGenerator(ABC):
         logger.info(f"DEBUG - self._is_local set to: {self._is_local}")
         
         self.schema = self._load_schema()
+        # Every random draw comes from these per-generator streams: NumPy for
+        # columns, random.Random for single cells, and the Faker instance
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+        self.fake = Faker()
+        if seed is not None:
+            self.fake.seed_instance(seed)
+        # Upper bound (epoch seconds) of datetime columns without a range; fixed for reproducible runs
+        self.reference_time = reference_time if reference_time is not None else time.time()
+        self._column_plans = None
+        # Row count override, e.g. sized by the rate controller; the schema's num_rows times scale_factor otherwise
+        self._num_rows = num_rows
+        self.scale_factor = scale_factor
+        # (index, count): generate only that row range of the table, into its own part file
+        self.shard = shard
+        # Rows before this one were written earlier, e.g. by a growing dimension's previous iterations
+        self.row_offset = row_offset
+        # Running totals across save_data calls; callers diff them per table
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+        self.upload_seconds = 0.0
+        
+    def reseed(self, seed):
+        """Restart the random streams from ``seed``, keeping compiled plans and pools.
+        
+        Column plans hold a reference to ``self.rng``, so its state is replaced
+        in place; the result matches a freshly built generator with this seed.
+        """
+        self.seed = seed
+        bit_generator = self.rng.bit_generator
+        bit_generator.state = type(bit_generator)(seed).state
+        self.random.seed(seed)
+        if seed is not None:
+            self.fake.seed_instance(seed)
         
     def _is_local_env(self):
         """Check if running in local environment."""
         return self._is_local
         
     def _load_schema(self):
-        """Load schema from YAML file."""
-        import yaml
+        """Load schema from YAML file, through the process-wide schema registry."""
         logger.info(f"Loading schema from: {self.schema_path}")
         
         # If schema_path is None, return an empty schema (used for cleanup operations)
         if self.schema_path is None:
             return {"table": "temp", "columns": []}
             
-        try:
-            with open(self.schema_path) as f:
-                return yaml.safe_load(f)
-        except Exception as e:
-            logger.error(f"Error loading schema from file: {str(e)}")
-            raise
+        return load_schema(self.schema_path)
+    
+    def _output_extension(self):
+        """File extension for the selected output format."""
+        return OUTPUT_FORMATS[self.output_format]['extension']
+    
+    def _output_file_name(self):
+        """File name of this save: data_<timestamp>, or part-<shard>-<timestamp> for a shard.
+        
+        Timestamps go down to microseconds, so back-to-back iterations (e.g. a
+        backfill or a growing dimension's deltas) never overwrite a file.
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        if self.shard is not None:
+            return f"part-{self.shard[0]:05d}-{timestamp}{self._output_extension()}"
+        return f"data_{timestamp}{self._output_extension()}"
     
     def _get_output_path(self, table_name):
         """Generate output path for the generated data."""
         if self._is_local_env():
             # Local environment: use standard path joining
             table_dir = os.path.join(self.output_base_path, os.path.basename(os.path.dirname(self.schema_path)), table_name)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            return os.path.join(table_dir, f"data_{timestamp}.csv")
+            return os.path.join(table_dir, self._output_file_name())
         else:
             # Databricks environment: ensure path starts with /Volumes/
             if not self.output_base_path.lower().startswith('/volumes/'):
@@ -58,17 +120,24 @@ class BaseGenerator(ABC):
             
             # Use forward slashes for Databricks paths
             table_dir = f"{self.output_base_path}/{os.path.basename(os.path.dirname(self.schema_path))}/{table_name}"
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            return f"{table_dir}/data_{timestamp}.csv"
+            return f"{table_dir}/{self._output_file_name()}"
     
-    def _check_directory_empty(self, directory):
-        """Check if directory is empty and clean it up if needed."""
+    def _check_directory_empty(self, directory, background=False, workers=CLEANUP_WORKERS):
+        """Check if directory is empty and clean it up if needed.
+        
+        Volume directories are listed and deleted with ``workers`` concurrent
+        calls. With ``background`` the old contents are deleted by a background
+        thread (see cleanup.py) so generation can start right away; the thread
+        is returned.
+        """
         if self._is_local_env():
             # Local environment check and cleanup
             if os.path.exists(directory):
                 if os.listdir(directory):
                     logger.info(f"Directory {directory} is not empty. Cleaning up...")
                     try:
+                        if background:
+                            return cleanup_local_in_background(directory)
                         import shutil
                         shutil.rmtree(directory)
                         logger.info(f"Successfully cleaned up directory: {directory}")
@@ -79,70 +148,54 @@ class BaseGenerator(ABC):
                 logger.info(f"Directory {directory} does not exist - will be created when needed")
         else:
             # Databricks environment check and cleanup
-            from databricks.sdk import WorkspaceClient
-            workspace = WorkspaceClient()
+            workspace = get_workspace_client()
             
             # Remove trailing slash for directory operations
             directory = directory.rstrip('/')
             
-            def delete_directory_recursive(dir_path):
-                """Recursively delete a directory and its contents."""
-                try:
-                    # List contents of the directory
-                    contents = list(workspace.files.list_directory_contents(dir_path))
-                    if contents:
-                        for item in contents:
-                            if item.is_directory:
-                                # Recursively delete subdirectories
-                                delete_directory_recursive(item.path)
-                            else:
-                                # Delete files
-                                workspace.files.delete(item.path)
-                        # Delete the empty directory
-                        workspace.files.delete_directory(dir_path)
-                        logger.info(f"Successfully cleaned up directory: {dir_path}")
-                except Exception as e:
-                    if "not found" not in str(e).lower():
-                        logger.error(f"Error cleaning up directory {dir_path}: {str(e)}")
-                        raise
-            
             try:
                 # Check if directory exists and has contents
                 contents = list(workspace.files.list_directory_contents(directory))
                 if contents:
                     logger.info(f"Directory {directory} is not empty. Cleaning up...")
-                    delete_directory_recursive(directory)
+                    if background:
+                        return cleanup_remote_in_background(directory, workspace, workers)
+                    deleted = delete_remote_tree(directory, workspace, workers)
+                    logger.info(f"Successfully cleaned up directory: {directory} ({deleted} files)")
             except Exception as e:
                 # If directory doesn't exist, that's fine - it will be created
-                if "not found" in str(e).lower():
+                if is_not_found(e):
                     logger.info(f"Directory {directory} does not exist - will be created when needed")
                 else:
                     logger.error(f"Unexpected error checking directory {directory}: {str(e)}")
                     raise
+        return None
     
-    def _save_to_databricks(self, df, output_path):
-        """Save data to Databricks UC volume using SDK."""
-        from databricks.sdk import WorkspaceClient
-        workspace = WorkspaceClient()
-        
+    def _write_batches(self, batches, binary_file):
+        """Write DataFrame batches in the selected output format."""
+        column_types = {col: plan.dtype for col, plan in self.column_plans.items()}
+        counter = CountingWriter(binary_file)
+        self.bytes_written += write_batches(batches, counter, self.output_format, column_types)
+        self.write_seconds += counter.write_seconds
+    
+    def _save_to_databricks(self, batches, output_path):
+        """Save data to Databricks UC volume using SDK, streaming without a temp file."""
         print(f"DEBUG - Full output path being used: {output_path}")
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as temp_file:
-            df.to_csv(temp_file.name, index=False)
-            
-            # Use Databricks SDK to write to UC volume
-            with open(temp_file.name, 'rb') as f:
-                workspace.files.upload(
-                    file_path=output_path,
-                    contents=f.read(),
-                    overwrite=True
-                )
-            
-            # Clean up the temporary file
-            os.unlink(temp_file.name)
+        # Use Databricks SDK to write to UC volume
+        if self.upload_pool is not None:
+            return self.upload_pool.submit(lambda f: self._write_batches(batches, f), output_path)
+        stats = upload_stream(lambda f: self._write_batches(batches, f), output_path)
+        self.upload_seconds += stats['upload_seconds']
+        return stats
     
-    def save_data(self, df, table_name):
-        """Save generated data to CSV file."""
+    def save_data(self, data, table_name):
+        """Save generated data to a file in the selected output format.
+        
+        ``data`` is either a DataFrame or an iterable of DataFrame batches (see
+        generate_batches), which are appended to the file one after another.
+        """
+        batches = [data] if isinstance(data, pd.DataFrame) else data
         output_path = self._get_output_path(table_name)
         output_dir = os.path.dirname(output_path)
         
@@ -158,7 +211,8 @@ class BaseGenerator(ABC):
                 logger.info(f"Creating directory: {output_dir}")
                 os.makedirs(output_dir, exist_ok=True)
                 logger.info(f"Writing data to: {output_path}")
-                df.to_csv(output_path, index=False)
+                with open(output_path, 'wb') as f:
+                    self._write_batches(batches, f)
                 logger.info("Data saved successfully")
             except Exception as e:
                 logger.error(f"Error saving data locally: {str(e)}")
@@ -167,8 +221,11 @@ class BaseGenerator(ABC):
             # Databricks deployment: use SDK to write to UC volume
             logger.info("Databricks environment detected - using SDK")
             try:
-                self._save_to_databricks(df, output_path)
-                logger.info("Data saved successfully via Databricks SDK")
+                self._save_to_databricks(batches, output_path)
+                if self.upload_pool is not None:
+                    logger.info("Data queued for upload via Databricks SDK")
+                else:
+                    logger.info("Data saved successfully via Databricks SDK")
             except Exception as e:
                 logger.error(f"Error saving data via Databricks SDK: {str(e)}")
                 raise
@@ -176,79 +233,153 @@ class BaseGenerator(ABC):
         logger.info(f"Generated file: {output_path}")
         return output_path
     
-    def _generate_value(self, col, col_def):
-        """Base method for generating values based on data type."""
-        # Check for null probability first
+    @staticmethod
+    def _parse_col_def(col_def):
+        """Split a column definition into (type, format, null probability)."""
         if isinstance(col_def, dict):
-            null_prob = col_def.get('null_probability', 0.0)
-            if random.random() < null_prob:
-                return None
-            
-            dtype = col_def.get('type', 'string')
-            format_spec = col_def.get('format')
-        else:
-            # Handle simple type definitions (e.g., "string", "int", etc.)
-            dtype = str(col_def).lower()  # Convert to lowercase string
-            format_spec = None
-            
+            return col_def.get('type', 'string'), col_def.get('format'), col_def.get('null_probability', 0.0)
+        # Handle simple type definitions (e.g., "string", "int", etc.)
+        return str(col_def).lower(), None, 0.0
+    
+    @property
+    def column_plans(self):
+        """Per-column generation plans, compiled from the schema on first use."""
+        if self._column_plans is None:
+            columns = self.schema.get('columns')
+            if not isinstance(columns, dict):
+                columns = {}
+            self._column_plans = {
+                col: self._compile_column_plan(col, col_def)
+                for col, col_def in columns.items()
+            }
+        return self._column_plans
+    
+    def _compile_column_plan(self, col, col_def):
+        """Compile a column definition into a ColumnPlan."""
+        dtype, format_spec, null_prob = self._parse_col_def(col_def)
+        rng, rand = self.rng, self.random
+        value_fn = self._resolve_value_fn(col, dtype, format_spec)
+        column_fn = None
+        
+        if dtype == 'int':
+            column_fn = lambda n: rng.integers(1, 10000, size=n)
+        elif dtype == 'float':
+            column_fn = lambda n: np.round(rng.uniform(0, 1000, size=n), 2)
+        elif dtype == 'bool':
+            column_fn = lambda n: rng.random(n) < 0.5
+        elif dtype == 'datetime':
+            column_fn = self._datetime_column_fn()
+        elif dtype == 'string' and format_spec:
+            # Choice lists and #/? patterns are parsed once and rendered in bulk
+            template = compile_format(format_spec)
+            column_fn = lambda n: template.render_column(n, rng)
+        elif dtype == 'string' and self.faker_pool_size:
+            # Pooled mode: sample precomputed Faker values instead of calling Faker
+            pool = get_pool(self._faker_provider(col), self.faker_pool_size, self.fake, self.faker_pool_dir)
+            cardinality = col_def.get('cardinality') if isinstance(col_def, dict) else None
+            value_fn = lambda: pool.sample(rand, cardinality)
+            column_fn = lambda n: pool.sample_column(n, rng, cardinality)
+        
+        return ColumnPlan(col, dtype, rng, value_fn=value_fn, column_fn=column_fn,
+                          null_probability=null_prob, format_spec=format_spec)
+    
+    def _datetime_column_fn(self):
+        """Vectorized counterpart of the datetime value generator."""
+        rng = self.rng
+        # Microseconds between the epoch and the reference time, matching Faker's date_time()
+        return lambda n: rng.integers(0, int(self.reference_time * 1_000_000), size=n).astype('datetime64[us]')
+    
+    @staticmethod
+    def _faker_provider(col):
+        """Pick the Faker provider for a string column from its name."""
         col_lower = col.lower()
+        if 'manufacturer' in col_lower or 'company' in col_lower:
+            return 'company'
+        elif 'name' in col_lower:
+            return 'name'
+        elif 'email' in col_lower:
+            return 'email'
+        elif 'address' in col_lower:
+            return 'address'
+        elif 'city' in col_lower:
+            return 'city'
+        elif 'state' in col_lower:
+            return 'state'
+        elif 'zip' in col_lower:
+            return 'zipcode'
+        elif 'country' in col_lower:
+            return 'country'
+        elif ('contact' in col_lower or 'phone' in col_lower) and 'number' in col_lower:
+            return 'phone_number'
+        return 'word'
+    
+    def _resolve_value_fn(self, col, dtype, format_spec):
+        """Resolve the per-cell value generator for a column's type and format."""
+        fake, rand = self.fake, self.random
         
         # Handle basic data types
         if dtype == 'int':
-            return random.randint(1, 9999)
+            return lambda: rand.randint(1, 9999)
         elif dtype == 'float':
-            return round(random.uniform(0, 1000), 2)
+            return lambda: round(rand.uniform(0, 1000), 2)
         elif dtype == 'bool':
-            return random.choice([True, False])
+            return lambda: rand.choice([True, False])
         elif dtype == 'string':
             if format_spec:
-                if '|' in format_spec:
-                    # Handle pipe-separated formats (e.g., "RES|COM|IND")
-                    return random.choice(format_spec.split('|'))
-                elif '#' in format_spec:
-                    # Handle formats with hash symbols for random digits
-                    result = format_spec
-                    while '#' in result:
-                        result = result.replace('#', str(random.randint(0, 9)), 1)
-                    return result
-                elif '?' in format_spec:
-                    # Handle formats with question marks for random letters
-                    result = format_spec
-                    while '?' in result:
-                        result = result.replace('?', random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), 1)
-                    return result
-                else:
-                    # Simple catch-all: return format as-is
-                    return format_spec
-            elif 'manufacturer' in col_lower or 'company' in col_lower:
-                return self.fake.company()
-            elif 'name' in col_lower:
-                return self.fake.name()
-            elif 'email' in col_lower:
-                return self.fake.email()
-            elif 'address' in col_lower:
-                return self.fake.address()
-            elif 'city' in col_lower:
-                return self.fake.city()
-            elif 'state' in col_lower:
-                return self.fake.state()
-            elif 'zip' in col_lower:
-                return self.fake.zipcode()
-            elif 'country' in col_lower:
-                return self.fake.country()
-            elif ('contact' in col_lower or 'phone' in col_lower) and 'number' in col_lower:
-                return f"({self.fake.random_number(digits=3)}) {self.fake.random_number(digits=3)}-{self.fake.random_number(digits=4)}"
+                # Choice lists ("RES|COM|IND"), #/? patterns and literals, see templates
+                template = compile_format(format_spec)
+                return lambda: template.render(rand)
             else:
-                return self.fake.word().title()
+                produce = FAKER_PROVIDERS[self._faker_provider(col)]
+                return lambda: produce(fake)
         elif dtype == 'datetime':
-            return self.fake.date_time().isoformat()
+            return lambda: fake.date_time(end_datetime=datetime.fromtimestamp(self.reference_time)).isoformat()
             
         error_msg = f"Unsupported data type: {dtype}"
         if format_spec:
             error_msg += f" with format: {format_spec}"
         raise ValueError(error_msg)
     
-    @abstractmethod
+    def _generate_column(self, col, num_rows):
+        """Generate a whole column from its compiled plan."""
+        return self.column_plans[col].column(num_rows)
+    
+    @property
+    def num_rows(self):
+        """Number of rows (or keys, for change feeds) to generate."""
+        if self._num_rows is not None:
+            return self._num_rows
+        return scaled_num_rows(self.schema, self.scale_factor)
+    
+    @property
+    def row_range(self):
+        """(start, stop) of the rows this generator produces: the whole table, or its shard's slice.
+        
+        Both start at row_offset, so keys continue after rows written earlier.
+        """
+        num_rows, offset = self.num_rows, self.row_offset
+        if self.shard is None:
+            return offset, offset + num_rows
+        index, count = self.shard
+        return offset + num_rows * index // count, offset + num_rows * (index + 1) // count
+    
     def generate_data(self):
-        """Generate data based on schema. Must be implemented by subclasses."""
-        raise NotImplementedError("Subclasses must implement generate_data()") 
\ No newline at end of file
+        """Generate the whole table (or shard) as a single DataFrame."""
+        start, stop = self.row_range
+        return self._generate_chunk(start, stop - start)
+    
+    def generate_batches(self, chunk_rows=None):
+        """Yield the table as DataFrames of at most ``chunk_rows`` rows each.
+        
+        Only one chunk is held in memory at a time, so peak memory is bounded by
+        ``chunk_rows`` rather than the size of the table.
+        """
+        first, stop = self.row_range
+        chunk_rows = chunk_rows or max(stop - first, 1)
+        for start in range(first, stop, chunk_rows):
+            yield self._generate_chunk(start, min(chunk_rows, stop - start))
+    
+    @abstractmethod
+    def _generate_chunk(self, start, num_rows):
+        """Generate rows ``start`` to ``start + num_rows``. Must be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement _generate_chunk()")
\ No newline at end of file
@@ -1,123 +1,234 @@
 from .base_generator import BaseGenerator
+from .change_feed_state import ChangeFeedState, DELETED, LIVE
+from .schema_registry import scaled_num_rows
+import logging
 import pandas as pd
-from faker import Faker
-import random
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# history: every iteration regenerates the full history of keys 1..num_rows
+# incremental: keys keep their current row across iterations and each batch continues the feed
+CHANGE_FEED_MODES = ('history', 'incremental')
+DEFAULT_CHANGE_FEED_MODE = 'history'
+
+# Columns the change feed fills in itself
+FEED_COLUMNS = ('operation', 'change_timestamp')
+
+
+def nullable(values):
+    """Integer values as a nullable Int64 array, so nulling cells keeps them integers instead of float64."""
+    if getattr(values, 'dtype', None) is not None and values.dtype.kind in 'iu':
+        return pd.array(values, dtype='Int64')
+    return values
+
+
+def resolve_change_feed_mode(schema, default=None):
+    """Mode of a change feed table: the YAML's change_feed_rules.mode, else ``default``."""
+    mode = schema.get('change_feed_rules', {}).get('mode') or default or DEFAULT_CHANGE_FEED_MODE
+    if mode not in CHANGE_FEED_MODES:
+        raise ValueError(f"Unsupported change feed mode: {mode}")
+    return mode
+
 
 class ChangeFeedGenerator(BaseGenerator):
-    def __init__(self, schema_path, output_base_path, is_local=True):
-        super().__init__(schema_path, output_base_path, is_local=is_local)
-        self.fake = Faker()
+    def __init__(self, schema_path, output_base_path, is_local=True, change_feed_mode=None, **kwargs):
+        super().__init__(schema_path, output_base_path, is_local=is_local, **kwargs)
         self.rules = self.schema['change_feed_rules']
+        # Parse the time range once instead of on every datetime cell
+        self.start_date = datetime.strptime(self.rules['time_range']['start_date'], '%Y-%m-%d')
+        self.end_date = datetime.strptime(self.rules['time_range']['end_date'], '%Y-%m-%d')
+        self.mode = resolve_change_feed_mode(self.schema, change_feed_mode)
+        self._feed_state = None
         
-    def _generate_initial_row(self, customer_id):
-        """Generate the initial INSERT row for a customer."""
-        row = {'customer_id': customer_id, 'operation': 'INSERT'}
-        
-        # Generate values for all columns except operation and customer_id
-        for col, col_def in self.schema['columns'].items():
-            if col not in ['operation', 'customer_id', 'change_timestamp']:
-                row[col] = self._generate_value(col, col_def)
-        
-        return row
-
-    def _generate_value(self, col, col_def):
-        """Generate a value based on column name and data type."""
-        if isinstance(col_def, str):
-            dtype = col_def
-        else:
-            dtype = col_def.get('type', 'string')
-            
+    def _resolve_value_fn(self, col, dtype, format_spec):
+        """Resolve the per-cell value generator for a column."""
         # Special handling for datetime in change feeds
         if dtype == 'datetime':
-            # Convert string dates to datetime objects for Faker
-            start_date = datetime.strptime(self.rules['time_range']['start_date'], '%Y-%m-%d')
-            end_date = datetime.strptime(self.rules['time_range']['end_date'], '%Y-%m-%d')
-            return self.fake.date_time_between(
+            start_date, end_date = self.start_date, self.end_date
+            return lambda: self.fake.date_time_between(
                 start_date=start_date,
                 end_date=end_date
             ).isoformat()
             
         # Use base implementation for all other types
-        return super()._generate_value(col, col_def)
+        return super()._resolve_value_fn(col, dtype, format_spec)
 
-    def _generate_update_row(self, base_row):
-        """Generate an UPDATE row based on the previous row."""
-        row = base_row.copy()
-        row['operation'] = 'UPDATE'
-        
-        # Update only the allowed fields
-        for field in self.rules['updatable_fields']:
-            if field in self.schema['columns']:
-                col_def = self.schema['columns'][field]
-                row[field] = self._generate_value(field, col_def)
-        
-        return row
+    def _datetime_column_fn(self):
+        """Vectorized datetimes drawn from the change feed time range."""
+        rng = self.rng
+        start = np.datetime64(self.start_date, 'us').astype('int64')
+        end = np.datetime64(self.end_date, 'us').astype('int64')
+        return lambda n: rng.integers(start, end + 1, size=n).astype('datetime64[us]')
 
-    def _generate_delete_row(self, base_row):
-        """Generate a DELETE row based on the previous row."""
-        row = base_row.copy()
-        row['operation'] = 'DELETE'
-        
-        # Null out the specified fields
-        for field in self.rules['delete_null_fields']:
-            row[field] = None
-            
-        return row
+    @property
+    def key_column(self):
+        """Key column of the feed: the first DLT key, else customer_id."""
+        keys = self.rules.get('dlt_config', {}).get('keys') or []
+        return keys[0] if keys else 'customer_id'
+
+    def _output_columns(self):
+        """Column order of both modes: the key, operation, the schema's other columns, change_timestamp."""
+        key_column = self.key_column
+        fields = [c for c in self.column_plans if c != key_column and c not in FEED_COLUMNS]
+        return [key_column, 'operation'] + fields + ['change_timestamp']
+
+    def _delete_probability(self):
+        """Chance that an event on a live key is a DELETE, matching the history mode's mix."""
+        distribution = self.rules['operation_distribution']
+        deletes = distribution.get('DELETE', 0)
+        # History mode gives each key 0..UPDATE updates, UPDATE / 2 on average
+        updates = distribution.get('UPDATE', 0) / 2
+        return deletes / (deletes + updates) if deletes + updates else 0.0
+
+    def _batch_window_us(self, num_events):
+        """Feed time a batch covers: each key changes every (min + max) / 2 days on average."""
+        gap = self.rules['time_between_changes']
+        mean_gap_us = (gap['min'] + gap['max']) / 2 * 86_400_000_000
+        return num_events * mean_gap_us / self._feed_state.tracked_keys
 
-    def _generate_timestamps(self, num_changes):
-        """Generate ordered timestamps for changes."""
-        start_date = datetime.strptime(self.rules['time_range']['start_date'], '%Y-%m-%d')
-        end_date = datetime.strptime(self.rules['time_range']['end_date'], '%Y-%m-%d')
+    def _incremental_state(self):
+        if self._feed_state is None:
+            tracked_keys = self.rules.get('tracked_keys')
+            if tracked_keys:
+                tracked_keys = max(1, round(tracked_keys * self.scale_factor))
+            else:
+                tracked_keys = scaled_num_rows(self.schema, self.scale_factor)
+            self._feed_state = ChangeFeedState(tracked_keys, self.start_date)
+        return self._feed_state
+
+    def _generate_incremental_chunk(self, num_events):
+        """Continue the feed with up to ``num_events`` events on distinct keys.
         
-        # Generate random timestamps within the range
-        timestamps = []
-        current_date = start_date
-        for _ in range(num_changes):
-            # Add random days between min and max
-            days_to_add = random.randint(
-                self.rules['time_between_changes']['min'],
-                self.rules['time_between_changes']['max']
-            )
-            current_date += timedelta(days=days_to_add)
-            if current_date > end_date:
-                break
-            timestamps.append(current_date)
-            
-        return sorted(timestamps)
+        Absent and deleted keys are (re-)inserted with fresh values. Live keys
+        get an UPDATE of their updatable fields or, with _delete_probability,
+        a DELETE. Operations are interleaved and stamped with increasing
+        timestamps that continue after the previous batch.
+        """
+        state = self._incremental_state()
+        rng = self.rng
+        key_column = self.key_column
+        num_events = min(num_events, state.tracked_keys)
+        keys = rng.choice(state.tracked_keys, size=num_events, replace=False)
+        live = state.status[keys] == LIVE
+        delete = live & (rng.random(num_events) < self._delete_probability())
+        update = live & ~delete
+        columns = [c for c in self.column_plans if c != key_column and c not in FEED_COLUMNS]
+
+        events = []
+        if (~live).any():
+            idx = keys[~live]
+            rows = pd.DataFrame({col: self._generate_column(col, len(idx)) for col in columns})
+            state.store(idx, rows, LIVE)
+            events.append((idx, 'INSERT', rows))
+        if update.any():
+            idx = keys[update]
+            rows = state.current(idx)
+            for field in self.rules['updatable_fields']:
+                if field in rows.columns:
+                    rows[field] = self._generate_column(field, len(idx))
+            state.store(idx, rows, LIVE)
+            events.append((idx, 'UPDATE', rows))
+        if delete.any():
+            idx = keys[delete]
+            rows = state.current(idx)
+            state.status[idx] = DELETED
+            # where() with an all-False mask nulls a column; nullable() keeps integer columns integers
+            keep = np.zeros(len(idx), dtype=bool)
+            for field in self.rules['delete_null_fields']:
+                if field in rows.columns:
+                    rows[field] = pd.Series(nullable(rows[field].to_numpy()), index=rows.index).where(keep)
+            events.append((idx, 'DELETE', rows))
+
+        frame = pd.concat([rows for _, _, rows in events], ignore_index=True)
+        frame[key_column] = np.concatenate([idx for idx, _, _ in events]) + 1
+        frame['operation'] = pd.Categorical(
+            np.concatenate([[operation] * len(idx) for idx, operation, _ in events]),
+            categories=['INSERT', 'UPDATE', 'DELETE']
+        )
+        frame = frame.take(rng.permutation(len(frame))).reset_index(drop=True)
+        frame['change_timestamp'] = state.advance(len(frame), self._batch_window_us(len(frame)), rng)
+
+        counts = state.counts()
+        logger.info(
+            f"Change feed {self.schema['table']}: {len(frame)} events "
+            f"({', '.join(f'{len(idx)} {operation}' for idx, operation, _ in events)}), "
+            f"keys live {counts['live']} / deleted {counts['deleted']} / not yet inserted {counts['absent']}, "
+            f"state {state.memory_bytes() / 1024 / 1024:.1f} MB"
+        )
+        return frame[self._output_columns()]
 
-    def generate_data(self):
-        """Generate all change feed data."""
-        all_rows = []
-        num_customers = self.schema['num_rows']
+    def _generate_chunk(self, start, num_rows):
+        """Generate the change history of keys start + 1 to start + num_rows.
         
-        for customer_id in range(1, num_customers + 1):
-            # Generate initial INSERT
-            base_row = self._generate_initial_row(customer_id)
-            
-            # Determine number of changes for this customer
-            num_updates = random.randint(0, self.rules['operation_distribution']['UPDATE'])
-            will_delete = random.random() < self.rules['operation_distribution']['DELETE']
-            
-            # Generate timestamps for all changes
-            num_changes = 1 + num_updates + (1 if will_delete else 0)  # INSERT + UPDATEs + (DELETE if any)
-            timestamps = self._generate_timestamps(num_changes)
-            
-            # Add INSERT with first timestamp
-            base_row['change_timestamp'] = timestamps[0].isoformat()
-            all_rows.append(base_row)
-            
-            # Add UPDATEs
-            current_row = base_row
-            for i in range(num_updates):
-                current_row = self._generate_update_row(current_row)
-                current_row['change_timestamp'] = timestamps[i + 1].isoformat()
-                all_rows.append(current_row)
-            
-            # Add DELETE if needed
-            if will_delete:
-                delete_row = self._generate_delete_row(current_row)
-                delete_row['change_timestamp'] = timestamps[-1].isoformat()
-                all_rows.append(delete_row)
+        In incremental mode ``num_rows`` events continue the feed instead.
+        """
+        if self.mode == 'incremental':
+            return self._generate_incremental_chunk(num_rows)
+        
+        return self._generate_history_chunk(start, num_rows)
+
+    def _generate_history_chunk(self, start, num_rows):
+        """Generate the full change history of keys start + 1 to start + num_rows, column by column.
         
-        return pd.DataFrame(all_rows) 
\ No newline at end of file
+        Update counts, delete flags and day gaps are drawn for all keys at once
+        and expanded into one row per event. Updatable fields get a fresh value
+        on every INSERT and UPDATE, other fields keep the key's INSERT value,
+        and a DELETE repeats the previous row with delete_null_fields nulled.
+        Events falling after the end of the time range are dropped.
+        """
+        rng = self.rng
+        distribution = self.rules['operation_distribution']
+        gap = self.rules['time_between_changes']
+
+        num_updates = rng.integers(0, distribution['UPDATE'] + 1, size=num_rows)
+        will_delete = rng.random(num_rows) < distribution['DELETE']
+        events_per_key = 1 + num_updates + will_delete
+        num_events = int(events_per_key.sum())
+        owner = np.repeat(np.arange(num_rows), events_per_key)
+        first = np.cumsum(events_per_key) - events_per_key
+        deletes = (first + events_per_key - 1)[will_delete]
+
+        # Operation codes: INSERT on each key's first event, DELETE on the flagged keys' last
+        codes = np.ones(num_events, dtype=np.int8)
+        codes[first] = 0
+        codes[deletes] = 2
+
+        # Each key's timestamps are the start date plus a running sum of its day gaps
+        days = rng.integers(gap['min'], gap['max'] + 1, size=num_events)
+        running = np.cumsum(days)
+        offsets = running - (running - days)[first][owner]
+        timestamps = (np.datetime64(self.start_date, 'D') + offsets).astype('datetime64[us]')
+
+        # A DELETE copies the row of the event before it; -1 marks the cells it nulls
+        source = np.arange(num_events)
+        source[deletes] -= 1
+        nulled_source = source.copy()
+        nulled_source[deletes] = -1
+        nulled_owner = owner.copy()
+        nulled_owner[deletes] = -1
+        updatable = set(self.rules['updatable_fields'])
+        delete_null_fields = set(self.rules['delete_null_fields'])
+
+        key_column = self.key_column
+        data = {
+            key_column: start + 1 + owner,
+            'operation': pd.Categorical.from_codes(codes, categories=['INSERT', 'UPDATE', 'DELETE']),
+        }
+        for col in self.column_plans:
+            if col in data or col in FEED_COLUMNS:
+                continue
+            nulled = col in delete_null_fields
+            if col in updatable:
+                values, indices = self._generate_column(col, num_events), nulled_source if nulled else source
+            else:
+                values, indices = self._generate_column(col, num_rows), nulled_owner if nulled else owner
+            if nulled:
+                values = nullable(values)
+            data[col] = pd.api.extensions.take(values, indices, allow_fill=nulled)
+        data['change_timestamp'] = timestamps
+
+        frame = pd.DataFrame(data)[self._output_columns()]
+        in_range = timestamps <= np.datetime64(self.end_date, 'us')
+        return frame if in_range.all() else frame[in_range].reset_index(drop=True)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+# Per-key status in an incremental change feed
+ABSENT, LIVE, DELETED = 0, 1, 2
+
+
+class ChangeFeedState:
+    """Current row of every key of an incremental change feed.
+
+    Keys are 1..tracked_keys. ``status`` holds one byte per key and ``slots``
+    maps a key to its position in ``rows``, a typed DataFrame (categorical
+    codes, nullable integers, datetimes) holding the current values of keys
+    that have been inserted. Memory is bounded by the key space, not by the
+    number of events emitted, and rows are read and written in bulk.
+    ``clock`` is the feed's latest change timestamp, in microseconds.
+    """
+
+    def __init__(self, tracked_keys, start_timestamp):
+        if tracked_keys < 1:
+            raise ValueError(f"A change feed needs at least one tracked key, got {tracked_keys}")
+        self.tracked_keys = tracked_keys
+        self.status = np.full(tracked_keys, ABSENT, dtype=np.uint8)
+        slot_dtype = np.int32 if tracked_keys < 2 ** 31 else np.int64
+        self.slots = np.full(tracked_keys, -1, dtype=slot_dtype)
+        self.rows = None
+        self.clock = int(np.datetime64(start_timestamp, 'us').astype('int64'))
+
+    def current(self, key_index):
+        """Current rows of the given (0-based) keys, in the same order."""
+        return self.rows.take(self.slots[key_index]).reset_index(drop=True)
+
+    def store(self, key_index, rows, status):
+        """Record ``rows`` as the current rows of ``key_index`` and set their status."""
+        slots = self.slots[key_index]
+        new = slots < 0
+        if new.any():
+            start = 0 if self.rows is None else len(self.rows)
+            appended = rows[new].reset_index(drop=True)
+            self.slots[key_index[new]] = np.arange(start, start + len(appended))
+            self.rows = appended if self.rows is None else pd.concat([self.rows, appended], ignore_index=True)
+        existing = ~new
+        if existing.any():
+            positions = slots[existing]
+            changed = rows[existing]
+            for position, col in enumerate(self.rows.columns):
+                self.rows.iloc[positions, position] = changed[col].array
+        self.status[key_index] = status
+
+    def advance(self, num_events, window_us, rng):
+        """Draw ``num_events`` ordered timestamps after the clock and move it to the end of the window."""
+        window_us = max(int(window_us), num_events, 1)
+        offsets = np.sort(rng.integers(1, window_us + 1, size=num_events))
+        timestamps = (self.clock + offsets).astype('datetime64[us]')
+        self.clock += window_us
+        return timestamps
+
+    def counts(self):
+        """Number of keys per status."""
+        counts = np.bincount(self.status, minlength=3)
+        return {'absent': int(counts[ABSENT]), 'live': int(counts[LIVE]), 'deleted': int(counts[DELETED])}
+
+    def memory_bytes(self):
+        rows = 0 if self.rows is None else int(self.rows.memory_usage(deep=True).sum())
+        return self.status.nbytes + self.slots.nbytes + rows
@@ -0,0 +1,166 @@
+import glob
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .volumes import call_with_retry, get_workspace_client
+
+logger = logging.getLogger(__name__)
+
+# Concurrent Files API calls used to list and delete a volume directory
+CLEANUP_WORKERS = 16
+# Seconds between progress log lines while deleting
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+def is_not_found(error):
+    """Whether a Files API error means the path is already gone."""
+    return type(error).__name__ in ('NotFound', 'ResourceDoesNotExist') or "not found" in str(error).lower()
+
+
+class _Progress:
+    """Thread-safe counter that logs deletion progress at most every PROGRESS_INTERVAL_SECONDS."""
+
+    def __init__(self, directory, total):
+        self.directory = directory
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+        self._last_report = self.start
+        self._lock = threading.Lock()
+
+    def advance(self):
+        with self._lock:
+            self.done += 1
+            now = time.perf_counter()
+            if now - self._last_report < PROGRESS_INTERVAL_SECONDS:
+                return
+            self._last_report = now
+        self.report()
+
+    def report(self):
+        elapsed = time.perf_counter() - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        logger.info(f"Cleanup of {self.directory}: deleted {self.done}/{self.total} files ({rate:.0f}/s)")
+
+
+def list_remote_tree(directory, workspace=None, workers=CLEANUP_WORKERS):
+    """Walk a volume directory one level at a time, listing each level concurrently.
+
+    Returns the file paths and the directory paths grouped by depth, with the
+    top directory first.
+    """
+    workspace = workspace or get_workspace_client()
+
+    def list_directory(path):
+        try:
+            return call_with_retry(lambda: list(workspace.files.list_directory_contents(path)), f"Listing {path}")[0]
+        except Exception as e:
+            if is_not_found(e):
+                return []
+            raise
+
+    files, levels = [], []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cleanup') as pool:
+        level = [directory]
+        while level:
+            levels.append(level)
+            subdirectories = []
+            for contents in pool.map(list_directory, level):
+                for item in contents:
+                    (subdirectories if item.is_directory else files).append(item.path)
+            level = subdirectories
+    return files, levels
+
+
+def delete_remote_tree(directory, workspace=None, workers=CLEANUP_WORKERS, tree=None, delete_directories=True):
+    """Delete a volume directory with ``workers`` concurrent Files API calls.
+
+    Files are deleted first, then directories deepest level first. ``tree``
+    is a (files, levels) listing from list_remote_tree; when given, only those
+    paths are deleted. Paths that are already gone are skipped. Returns the
+    number of files deleted.
+    """
+    workspace = workspace or get_workspace_client()
+    files, levels = tree if tree is not None else list_remote_tree(directory, workspace, workers)
+    progress = _Progress(directory, len(files))
+
+    def delete_file(path):
+        try:
+            call_with_retry(lambda: workspace.files.delete(path), f"Deleting {path}")
+        except Exception as e:
+            if not is_not_found(e):
+                raise
+        progress.advance()
+
+    def delete_directory(path):
+        try:
+            call_with_retry(lambda: workspace.files.delete_directory(path), f"Deleting directory {path}")
+        except Exception as e:
+            if not is_not_found(e):
+                raise
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cleanup') as pool:
+        # Consuming the results re-raises the first failure
+        list(pool.map(delete_file, files))
+        if delete_directories:
+            for level in reversed(levels):
+                list(pool.map(delete_directory, level))
+    progress.report()
+    return len(files)
+
+
+def _run_in_background(name, target):
+    def run():
+        try:
+            target()
+        except Exception as e:
+            logger.error(f"Background cleanup {name} failed: {str(e)}")
+
+    thread = threading.Thread(target=run, name=f"cleanup {name}", daemon=True)
+    thread.start()
+    return thread
+
+
+def cleanup_remote_in_background(directory, workspace=None, workers=CLEANUP_WORKERS):
+    """Snapshot a volume directory and delete that snapshot in a background thread.
+
+    The Files API cannot rename directories, so instead of moving the old
+    tree aside only the files listed now are deleted. Files written by the
+    new run are therefore kept, and so are the directories, which the new run
+    may already be writing into. Returns the cleanup thread.
+    """
+    workspace = workspace or get_workspace_client()
+    tree = list_remote_tree(directory, workspace, workers)
+    logger.info(f"Deleting {len(tree[0])} files from {directory} in the background")
+    return _run_in_background(
+        directory,
+        lambda: delete_remote_tree(directory, workspace, workers, tree=tree, delete_directories=False)
+    )
+
+
+def cleanup_local_in_background(directory):
+    """Move a local directory aside and delete it in a background thread.
+
+    The directory is renamed to ``<directory>.trash-<timestamp>`` so the path is
+    free for the new run at once. Trash left over by interrupted cleanups is
+    removed as well. Returns the cleanup thread.
+    """
+    trash = f"{directory.rstrip(os.sep)}.trash-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    os.rename(directory, trash)
+    logger.info(f"Moved {directory} to {trash} for background cleanup")
+
+    def remove_trash():
+        for path in glob.glob(f"{glob.escape(directory.rstrip(os.sep))}.trash-*"):
+            try:
+                shutil.rmtree(path)
+            except FileNotFoundError:
+                # Another background cleanup got there first
+                continue
+            logger.info(f"Successfully cleaned up directory: {path}")
+
+    return _run_in_background(directory, remove_trash)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+
+def apply_null_mask(values, null_prob, rng):
+    """Null out a random fraction of a column in one shot."""
+    if not null_prob:
+        return values
+    mask = rng.random(len(values)) < null_prob
+    if not mask.any():
+        return values
+
+    if isinstance(values, pd.Categorical):
+        codes = values.codes.copy()
+        codes[mask] = -1
+        return pd.Categorical.from_codes(codes, categories=values.categories)
+    if values.dtype.kind == 'i':
+        return pd.arrays.IntegerArray(values.astype('int64'), mask)
+    if values.dtype.kind == 'b':
+        return pd.arrays.BooleanArray(values, mask)
+    if values.dtype.kind in 'fM':
+        values = values.copy()
+        values[mask] = np.nan if values.dtype.kind == 'f' else np.datetime64('NaT')
+        return values
+    values = values.astype(object)
+    values[mask] = None
+    return values
+
+
+class ColumnPlan:
+    """Generation plan for a single schema column, compiled once per generator.
+
+    A plan carries the column's resolved type, format and null probability
+    together with prebuilt callables: ``value_fn`` produces one cell and
+    ``column_fn(num_rows)`` produces a whole array. Either may be missing, in
+    which case it is derived from the other.
+    """
+
+    def __init__(self, name, dtype, rng, value_fn=None, column_fn=None, null_probability=0.0, format_spec=None):
+        if value_fn is None and column_fn is None:
+            raise ValueError(f"Column plan for {name} needs a value_fn or a column_fn")
+        self.name = name
+        self.dtype = dtype
+        self.format_spec = format_spec
+        self.null_probability = null_probability or 0.0
+        self.rng = rng
+        self.value_fn = value_fn
+        self.column_fn = column_fn
+
+    def value(self):
+        """Generate a single cell."""
+        if self.null_probability and self.rng.random() < self.null_probability:
+            return None
+        if self.value_fn is not None:
+            return self.value_fn()
+        value = self.column_fn(1)[0]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def column(self, num_rows):
+        """Generate a whole column of ``num_rows`` values."""
+        if self.column_fn is not None:
+            values = self.column_fn(num_rows)
+        else:
+            values = np.empty(num_rows, dtype=object)
+            value_fn = self.value_fn
+            for i in range(num_rows):
+                values[i] = value_fn()
+        return apply_null_mask(values, self.null_probability, self.rng)
+
+    def __repr__(self):
+        return f"ColumnPlan({self.name!r}, dtype={self.dtype!r}, vectorized={self.column_fn is not None})"
@@ -1,29 +1,18 @@
 from .base_generator import BaseGenerator
 import pandas as pd
-from faker import Faker
-import random
+import numpy as np
 
 class DimensionGenerator(BaseGenerator):
-    def __init__(self, schema_path, output_base_path, is_local=True):
-        super().__init__(schema_path, output_base_path, is_local=is_local)
-        self.fake = Faker()
+    def __init__(self, schema_path, output_base_path, is_local=True, **kwargs):
+        super().__init__(schema_path, output_base_path, is_local=is_local, **kwargs)
         
-    def _generate_value(self, col, col_def):
-        """Generate a value based on column definition."""
-        return super()._generate_value(col, col_def)
-        
-    def generate_data(self):
-        """Generate dimension table data."""
-        rows = []
-        num_rows = self.schema.get('num_rows', 10)
-        
-        for i in range(1, num_rows + 1):
-            row = {}
-            for col, col_def in self.schema['columns'].items():
-                if col.endswith('_id'):
-                    row[col] = i
-                else:
-                    row[col] = self._generate_value(col, col_def)
-            rows.append(row)
+    def _generate_chunk(self, start, num_rows):
+        """Generate dimension table rows with sequential keys from start + 1."""
+        data = {}
+        for col in self.column_plans:
+            if col.endswith('_id'):
+                data[col] = np.arange(start + 1, start + num_rows + 1)
+            else:
+                data[col] = self._generate_column(col, num_rows)
             
-        return pd.DataFrame(rows) 
\ No newline at end of file
+        return pd.DataFrame(data)
@@ -0,0 +1,239 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .parallel import generate_table
+
+logger = logging.getLogger(__name__)
+
+# Longest a coordinator waits for a worker to generate one table (or shard)
+TASK_TIMEOUT_SECONDS = 3600
+STATUS_TIMEOUT_SECONDS = 5
+
+
+def _request(url, payload=None, timeout=STATUS_TIMEOUT_SECONDS):
+    """GET ``url``, or POST ``payload`` to it as JSON, and return the decoded JSON response."""
+    data = None if payload is None else json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class GenerationWorker:
+    """Runs table tasks sent by a coordinator, see serve_worker.
+
+    With ``processes`` > 1 tasks run in a spawn process pool of that size,
+    otherwise one at a time in the request thread. ``schema_dir`` replaces the
+    coordinator's schema directory in task paths, so workers on other hosts
+    read their own checkout of the schemas.
+    """
+
+    def __init__(self, processes=1, schema_dir=None):
+        self.capacity = max(processes, 1)
+        self.schema_dir = schema_dir
+        self._executor = None
+        if processes > 1:
+            self._executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'running': 0, 'completed': 0, 'failed': 0, 'rows': 0, 'bytes': 0}
+
+    def status(self):
+        with self._stats_lock:
+            return {'capacity': self.capacity, 'pid': os.getpid(), **self.stats}
+
+    def run(self, task):
+        """Generate one table task and return its result."""
+        if self.schema_dir is not None:
+            industry = os.path.basename(os.path.dirname(task['schema_path']))
+            task['schema_path'] = os.path.join(self.schema_dir, industry, os.path.basename(task['schema_path']))
+        if task.get('shard') is not None:
+            task['shard'] = tuple(task['shard'])
+
+        with self._stats_lock:
+            self.stats['running'] += 1
+        try:
+            if self._executor is not None:
+                result = self._executor.submit(generate_table, task).result()
+            else:
+                with self._lock:
+                    result = generate_table(task)
+        except Exception:
+            with self._stats_lock:
+                self.stats['failed'] += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self.stats['running'] -= 1
+
+        with self._stats_lock:
+            self.stats['completed'] += 1
+            self.stats['rows'] += result['rows']
+            self.stats['bytes'] += result['bytes']
+        shard = '' if task.get('shard') is None else f" shard {task['shard'][0] + 1}/{task['shard'][1]}"
+        logger.info(f"Iteration {task.get('iteration')}: table {task['table']}{shard}: {result['rows']} rows -> {result['output_path']}")
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _make_handler(worker):
+    class WorkerHandler(BaseHTTPRequestHandler):
+        def _reply(self, code, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path != '/status':
+                self._reply(404, {'error': f"Unknown path {self.path}"})
+                return
+            self._reply(200, worker.status())
+
+        def do_POST(self):
+            if self.path != '/tasks':
+                self._reply(404, {'error': f"Unknown path {self.path}"})
+                return
+            try:
+                task = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            except ValueError as e:
+                self._reply(400, {'error': f"Invalid task: {e}"})
+                return
+            try:
+                result = worker.run(task)
+            except Exception as e:
+                logger.error(f"Error generating table {task.get('table')}: {str(e)}")
+                self._reply(500, {'error': str(e)})
+                return
+            self._reply(200, result)
+
+        def log_message(self, format, *args):
+            logger.debug(f"{self.address_string()} {format % args}")
+
+    return WorkerHandler
+
+
+def serve_worker(host='127.0.0.1', port=8765, processes=1, schema_dir=None):
+    """Serve a GenerationWorker over HTTP until interrupted.
+
+    POST /tasks takes a table task (see parallel.generate_table) as JSON and
+    answers with its result once the table is written; GET /status reports
+    the worker's capacity and running totals.
+    """
+    worker = GenerationWorker(processes, schema_dir)
+    server = ThreadingHTTPServer((host, port), _make_handler(worker))
+    logger.info(f"Generation worker listening on http://{host}:{server.server_port} with capacity {worker.capacity}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        worker.shutdown()
+
+
+class RemoteExecutor:
+    """Coordinator side: hands table tasks to generation workers over HTTP.
+
+    Each worker at ``urls`` is asked for its capacity once, and gets at most
+    that many tasks at a time. ``submit`` returns a Future of the task's
+    result. A task whose worker cannot be reached is retried on the others and
+    the worker is dropped; a task that fails on a worker raises RuntimeError.
+    ``worker_status`` aggregates progress per worker.
+    """
+
+    def __init__(self, urls, timeout=TASK_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._slots = queue.Queue()
+        self._lock = threading.Lock()
+        self.workers = {}
+        for url in urls:
+            url = url.rstrip('/')
+            try:
+                capacity = int(_request(f"{url}/status")['capacity'])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping generation worker {url}: {str(e)}")
+                continue
+            self.workers[url] = {
+                'up': True, 'capacity': capacity, 'running': 0, 'completed': 0, 'failed': 0,
+                'rows': 0, 'bytes': 0, 'last_table': None, 'last_iteration': None,
+            }
+            for _ in range(capacity):
+                self._slots.put(url)
+        if not self.workers:
+            logger.error(f"None of the generation workers are reachable: {', '.join(urls)}")
+            raise ValueError(f"None of the generation workers are reachable: {', '.join(urls)}")
+        self._live_slots = self._slots.qsize()
+        self._executor = ThreadPoolExecutor(max_workers=self._live_slots, thread_name_prefix='remote')
+        logger.info(f"Connected to {len(self.workers)} generation workers with {self._live_slots} slots")
+
+    def submit(self, task):
+        return self._executor.submit(self._run, task)
+
+    def _take_slot(self):
+        while True:
+            with self._lock:
+                if self._live_slots == 0:
+                    raise RuntimeError("No generation workers left")
+            try:
+                return self._slots.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _run(self, task):
+        while True:
+            url = self._take_slot()
+            stats = self.workers[url]
+            with self._lock:
+                stats['running'] += 1
+            start = time.perf_counter()
+            try:
+                result = _request(f"{url}/tasks", task, timeout=self.timeout)
+            except urllib.error.HTTPError as e:
+                with self._lock:
+                    stats['running'] -= 1
+                    stats['failed'] += 1
+                self._slots.put(url)
+                try:
+                    error = json.loads(e.read()).get('error')
+                except ValueError:
+                    error = e.reason
+                raise RuntimeError(f"Worker {url} failed to generate {task['table']}: {error}") from e
+            except OSError as e:
+                # Unreachable (or timed out): drop this slot and retry elsewhere
+                logger.warning(f"Generation worker {url} unavailable for {task['table']}: {str(e)}")
+                with self._lock:
+                    stats['running'] -= 1
+                    stats['up'] = False
+                    self._live_slots -= 1
+                continue
+
+            with self._lock:
+                stats['running'] -= 1
+                stats['completed'] += 1
+                stats['rows'] += result['rows']
+                stats['bytes'] += result['bytes']
+                stats['last_table'] = task['table']
+                stats['last_iteration'] = task.get('iteration')
+            self._slots.put(url)
+            logger.debug(f"Worker {url} generated {task['table']} in {time.perf_counter() - start:.2f}s")
+            return result
+
+    def worker_status(self):
+        """Per-worker progress: capacity, running and completed tasks, rows and bytes written."""
+        with self._lock:
+            return {url: dict(stats) for url, stats in self.workers.items()}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
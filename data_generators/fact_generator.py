@@ -1,88 +1,80 @@
 from .base_generator import BaseGenerator
+from .column_plan import ColumnPlan
+from .samplers import KeySampler
 import pandas as pd
-from faker import Faker
-import random
+import numpy as np
 
 class FactGenerator(BaseGenerator):
-    def __init__(self, schema_path, output_base_path, dimension_key_ranges, is_local=True):
-        super().__init__(schema_path, output_base_path, is_local=is_local)
-        self.fake = Faker()
+    def __init__(self, schema_path, output_base_path, dimension_key_ranges, is_local=True, **kwargs):
+        super().__init__(schema_path, output_base_path, is_local=is_local, **kwargs)
         self.dimension_key_ranges = dimension_key_ranges
         
-    def _generate_value(self, col, col_def):
-        """Generate a value based on column definition."""
-        # Check if there are data quality rules for this column
+    def _compile_column_plan(self, col, col_def):
+        """Compile a column plan, honouring key ranges and quality rules."""
+        rng, rand = self.rng, self.random
+        
+        if col in self.dimension_key_ranges:
+            # One integer draw covers every foreign key in the batch; the range is
+            # looked up per call so it follows updates to dimension_key_ranges
+            key_ranges = self.dimension_key_ranges
+            distribution = col_def.get('distribution') if isinstance(col_def, dict) else None
+            if distribution and distribution.get('type', 'uniform') != 'uniform':
+                # Skewed keys: alias table sampling, rebuilt only when the range changes
+                sampler = KeySampler(distribution)
+                return ColumnPlan(col, 'int', rng,
+                                  column_fn=lambda n: sampler.sample(rng, key_ranges[col], n))
+            return ColumnPlan(col, 'int', rng,
+                              value_fn=lambda: rand.randint(1, key_ranges[col]),
+                              column_fn=lambda n: rng.integers(1, key_ranges[col] + 1, size=n))
+        
         if 'data_quality_rules' in self.schema and col in self.schema['data_quality_rules']:
             rules = self.schema['data_quality_rules'][col]
             min_value = rules.get('min_value')
             max_value = rules.get('max_value')
             anomaly_percentage = rules.get('anomaly_percentage', 0)
             
-            # Randomly decide if this value should be an anomaly
-            if random.random() < anomaly_percentage:
-                # Generate an anomalous value outside the normal range
-                if random.random() < 0.5:  # 50% chance of being below min
-                    value = min_value - random.uniform(0.1, 0.3)  # 10-30% below min
-                else:  # 50% chance of being above max
-                    value = max_value + random.uniform(0.1, 0.3)  # 10-30% above max
-            else:
-                # Generate a normal value within the range
-                value = random.uniform(min_value, max_value)
-            
-            # Round to 2 decimal places for float values
-            if isinstance(value, float):
-                value = round(value, 2)
+            def quality_rule_column(n):
+                # Normal values within the range, then overwrite the anomalous slots
+                values = rng.uniform(min_value, max_value, size=n)
+                anomalies = rng.random(n) < anomaly_percentage
+                if anomalies.any():
+                    count = int(anomalies.sum())
+                    below = rng.random(count) < 0.5  # 50% chance of being below min
+                    offsets = rng.uniform(0.1, 0.3, size=count)
+                    values[anomalies] = np.where(below, min_value - offsets, max_value + offsets)
                 
-            return value
+                # Round to 2 decimal places for float values
+                return np.round(values, 2)
             
-        # Use base implementation if no quality rules
-        return super()._generate_value(col, col_def)
-
-    def _generate_value_with_quality_rules(self, col, col_def):
-        """Generate a value considering data quality rules if they exist."""
-        value = self._generate_value(col, col_def)
-        
-        # Check if there are data quality rules for this column
-        if 'data_quality_rules' in self.schema and col in self.schema['data_quality_rules']:
-            rules = self.schema['data_quality_rules'][col]
-            min_value = rules.get('min_value')
-            max_value = rules.get('max_value')
-            anomaly_percentage = rules.get('anomaly_percentage', 0)
+            def quality_rule_value():
+                if rand.random() < anomaly_percentage:
+                    if rand.random() < 0.5:
+                        return round(min_value - rand.uniform(0.1, 0.3), 2)
+                    return round(max_value + rand.uniform(0.1, 0.3), 2)
+                return round(rand.uniform(min_value, max_value), 2)
             
-            # Randomly decide if this value should be an anomaly
-            if random.random() < anomaly_percentage:
-                # Generate an anomalous value outside the normal range
-                if random.random() < 0.5:  # 50% chance of being below min
-                    value = min_value - random.uniform(0.1, 0.3)  # 10-30% below min
-                else:  # 50% chance of being above max
-                    value = max_value + random.uniform(0.1, 0.3)  # 10-30% above max
-            else:
-                # Generate a normal value within the range
-                value = random.uniform(min_value, max_value)
-            
-            # Round to 2 decimal places for float values
-            if isinstance(value, float):
-                value = round(value, 2)
+            return ColumnPlan(col, 'float', rng, value_fn=quality_rule_value, column_fn=quality_rule_column)
         
-        return value
+        return super()._compile_column_plan(col, col_def)
         
-    def generate_data(self):
-        """Generate fact table data."""
-        rows = []
-        num_rows = self.schema.get('num_rows', 10)
+    @property
+    def surrogate_key(self):
+        """The table's own key: its first column if that is an ``_id`` column other than a dimension key."""
+        first = next(iter(self.column_plans), None)
+        if first is not None and first.endswith('_id') and first not in self.dimension_key_ranges:
+            return first
+        return None
         
-        for _ in range(num_rows):
-            row = {}
-            for col, col_def in self.schema['columns'].items():
-                if col in self.dimension_key_ranges:
-                    # Use dimension key ranges for foreign keys
-                    row[col] = self.fake.random_int(min=1, max=self.dimension_key_ranges[col])
-                elif 'data_quality_rules' in self.schema and col in self.schema['data_quality_rules']:
-                    # Use quality rules if they exist for this column
-                    row[col] = self._generate_value_with_quality_rules(col, col_def)
-                else:
-                    # Use standard value generation if no quality rules
-                    row[col] = self._generate_value(col, col_def)
-            rows.append(row)
-            
-        return pd.DataFrame(rows) 
\ No newline at end of file
+    def _generate_chunk(self, start, num_rows):
+        """Generate fact table rows column by column.
+        
+        The surrogate key numbers rows from start + 1. Rows start after the
+        table's earlier iterations (row_offset) and after the preceding
+        shards, so keys stay unique across a run.
+        """
+        key = self.surrogate_key
+        data = {
+            col: np.arange(start + 1, start + num_rows + 1) if col == key else self._generate_column(col, num_rows)
+            for col in self.column_plans
+        }
+        return pd.DataFrame(data)
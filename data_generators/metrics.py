@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+
+# Iterations kept for the JSON view; Prometheus counters cover the whole run
+HISTORY = 20
+# Per-table timings exported as <name>_seconds_total
+TABLE_TIMINGS = ('generate', 'serialize', 'write', 'upload')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = {k: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for k, v in labels.items()}
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped.items()) + '}'
+
+
+class GenerationMetrics:
+    """Per-iteration and cumulative metrics of one generation run.
+
+    record_iteration() takes the table results of an iteration (see
+    parallel.generate_table) plus its timing against the cadence. snapshot()
+    returns the run totals and the last HISTORY iterations as a dict, and
+    prometheus() renders the totals in the Prometheus text format. Safe to
+    read from request threads while the generation thread records.
+    """
+
+    def __init__(self, industry=None, interval_seconds=None, history=HISTORY):
+        self.industry = industry
+        self.interval_seconds = interval_seconds
+        self.started_at = time.time()
+        self.iterations = deque(maxlen=history)
+        self.iteration_count = 0
+        self.overruns = 0
+        self.tables = {}
+        self._lock = threading.Lock()
+
+    def record_iteration(self, iteration, results, elapsed_seconds, lag_seconds=0.0):
+        """Add one iteration's table results; ``lag_seconds`` is how late it started against the cadence."""
+        tables = {}
+        for result in results:
+            tables[result['table']] = {
+                'type': result['table_type'],
+                'rows': result['rows'],
+                'bytes': result['bytes'],
+                **{f'{timing}_seconds': result.get(f'{timing}_seconds') for timing in TABLE_TIMINGS},
+            }
+        overran = self.interval_seconds is not None and elapsed_seconds > self.interval_seconds
+        entry = {
+            'iteration': iteration,
+            'finished_at': time.time(),
+            'elapsed_seconds': elapsed_seconds,
+            'lag_seconds': lag_seconds,
+            'overran': overran,
+            'rows': sum(t['rows'] for t in tables.values()),
+            'bytes': sum(t['bytes'] for t in tables.values()),
+            'tables': tables,
+        }
+
+        with self._lock:
+            self.iterations.append(entry)
+            self.iteration_count += 1
+            self.overruns += overran
+            for table, values in tables.items():
+                totals = self.tables.setdefault(table, {
+                    'type': values['type'], 'rows': 0, 'bytes': 0,
+                    **{f'{timing}_seconds': 0.0 for timing in TABLE_TIMINGS},
+                })
+                for key, value in values.items():
+                    if key != 'type' and value is not None:
+                        totals[key] += value
+        return entry
+
+    def snapshot(self):
+        """Run totals and recent iterations as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                'industry': self.industry,
+                'interval_seconds': self.interval_seconds,
+                'started_at': self.started_at,
+                'iteration_count': self.iteration_count,
+                'overruns': self.overruns,
+                'tables': {table: dict(totals) for table, totals in self.tables.items()},
+                'iterations': [dict(entry) for entry in self.iterations],
+            }
+
+    def prometheus(self):
+        """Run totals in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        last = snapshot['iterations'][-1] if snapshot['iterations'] else None
+        run = {'industry': self.industry} if self.industry else {}
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP streamforge_{name} {help_text}')
+            lines.append(f'# TYPE streamforge_{name} {kind}')
+            for labels, value in samples:
+                lines.append(f'streamforge_{name}{_format_labels(labels)} {value}')
+
+        metric('iterations_total', 'counter', 'Completed generation iterations.', [(run, snapshot['iteration_count'])])
+        metric('iteration_overruns_total', 'counter', 'Iterations that took longer than the interval.', [(run, snapshot['overruns'])])
+        if self.interval_seconds is not None:
+            metric('interval_seconds', 'gauge', 'Configured iteration cadence.', [(run, self.interval_seconds)])
+        if last is not None:
+            metric('last_iteration_seconds', 'gauge', 'Wall time of the last iteration.', [(run, round(last['elapsed_seconds'], 6))])
+            metric('last_iteration_lag_seconds', 'gauge', 'How late the last iteration started against the cadence.',
+                   [(run, round(last['lag_seconds'], 6))])
+
+        tables = snapshot['tables']
+        labelled = [({**run, 'table': table, 'type': totals['type']}, totals) for table, totals in sorted(tables.items())]
+        metric('rows_total', 'counter', 'Rows written per table.', [(labels, t['rows']) for labels, t in labelled])
+        metric('bytes_total', 'counter', 'Bytes written per table.', [(labels, t['bytes']) for labels, t in labelled])
+        for timing in TABLE_TIMINGS:
+            metric(f'{timing}_seconds_total', 'counter', f'Seconds spent in {timing} per table.',
+                   [(labels, round(t[f'{timing}_seconds'], 6)) for labels, t in labelled])
+        return '\n'.join(lines) + '\n'
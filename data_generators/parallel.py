@@ -0,0 +1,198 @@
+import logging
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from .dimension_generator import DimensionGenerator
+from .fact_generator import FactGenerator
+from .change_feed_generator import ChangeFeedGenerator
+from .schema_registry import load_schema
+from .writers import DEFAULT_OUTPUT_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# Generators kept across iterations of a run, per process
+_generators = {}
+_generators_lock = threading.Lock()
+
+
+def table_seed(base_seed, iteration, table):
+    """Derive a deterministic seed for one table in one iteration of a run."""
+    sequence = np.random.SeedSequence([base_seed, iteration, zlib.crc32(table.encode('utf-8'))])
+    return int(sequence.generate_state(1)[0])
+
+
+def shard_tasks(task, shards):
+    """Split a table task into ``shards`` tasks, each generating one row range into its own part file.
+
+    Each shard gets its own random stream derived from the table's seed.
+    """
+    if shards <= 1:
+        return [task]
+    seed = task.get('seed')
+    seeds = np.random.SeedSequence(seed).spawn(shards) if seed is not None else [None] * shards
+    return [
+        dict(task, shard=(index, shards), seed=None if seeds[index] is None else int(seeds[index].generate_state(1)[0]))
+        for index in range(shards)
+    ]
+
+
+def merge_shard_results(results):
+    """Combine the results of a table's shards into one result per table, in first-seen order.
+
+    Rows, bytes and timings are summed, so timings add up worker time rather
+    than wall time. A sharded table's output_path is its directory.
+    """
+    merged = {}
+    for result in results:
+        total = merged.get(result['table'])
+        if total is None:
+            merged[result['table']] = dict(result, shards=1)
+            continue
+        total['shards'] += 1
+        total['output_path'] = os.path.dirname(result['output_path'])
+        for key in ('rows', 'bytes', 'generate_seconds', 'save_seconds', 'serialize_seconds', 'write_seconds'):
+            total[key] += result[key]
+        if result['upload_seconds'] is not None:
+            total['upload_seconds'] = (total['upload_seconds'] or 0.0) + result['upload_seconds']
+    return list(merged.values())
+
+
+def create_generator(task, upload_pool=None):
+    """Build the generator for a table task."""
+    options = {
+        'is_local': task['is_local'],
+        'seed': task.get('seed'),
+        'faker_pool_size': task.get('faker_pool_size'),
+        'faker_pool_dir': task.get('faker_pool_dir'),
+        'output_format': task.get('output_format', DEFAULT_OUTPUT_FORMAT),
+        'upload_pool': upload_pool,
+        'num_rows': task.get('num_rows'),
+        'reference_time': task.get('reference_time'),
+        'shard': task.get('shard'),
+        'scale_factor': task.get('scale_factor', 1),
+        'row_offset': task.get('row_offset', 0),
+    }
+    table_type = task['table_type']
+    if table_type == 'dimension':
+        return DimensionGenerator(task['schema_path'], task['output_path'], **options)
+    elif table_type == 'fact':
+        return FactGenerator(task['schema_path'], task['output_path'], task['dimension_key_ranges'], **options)
+    elif table_type == 'change_feed':
+        return ChangeFeedGenerator(
+            task['schema_path'], task['output_path'], change_feed_mode=task.get('change_feed_mode'), **options
+        )
+    raise ValueError(f"Unknown table type: {table_type}")
+
+
+def _generator_key(task):
+    """Everything fixed when a generator is built; a change means building a new one."""
+    return (
+        task['table'], task['table_type'], task['schema_path'], task['output_path'], task['is_local'],
+        task.get('output_format', DEFAULT_OUTPUT_FORMAT), task.get('faker_pool_size'), task.get('faker_pool_dir'),
+        tuple(sorted(task.get('dimension_key_ranges') or {})), task.get('change_feed_mode'), task.get('shard'),
+        task.get('scale_factor', 1),
+    )
+
+
+def get_generator(task, upload_pool=None):
+    """Return the generator for a table task, reusing the one from an earlier iteration.
+
+    A reused generator keeps its parsed schema, Faker instance and compiled
+    column plans; it is only reseeded and given this task's row count, key
+    ranges, reference time and upload pool. It is rebuilt when the schema
+    file changed.
+    """
+    key = _generator_key(task)
+    with _generators_lock:
+        generator = _generators.get(key)
+        if generator is None or generator.schema is not load_schema(task['schema_path']):
+            generator = create_generator(task, upload_pool)
+            _generators[key] = generator
+            return generator
+
+    generator.reseed(task.get('seed'))
+    generator.upload_pool = upload_pool
+    generator._num_rows = task.get('num_rows')
+    generator.row_offset = task.get('row_offset', 0)
+    if task.get('reference_time') is not None:
+        generator.reference_time = task['reference_time']
+    if task['table_type'] == 'fact':
+        # Updated in place: compiled foreign key plans read this dict
+        generator.dimension_key_ranges.update(task['dimension_key_ranges'])
+    return generator
+
+
+def clear_generators():
+    """Forget the generators kept for the current run."""
+    with _generators_lock:
+        _generators.clear()
+
+
+def _timed(batches, stats):
+    """Pass batches through while accumulating rows and time spent generating them."""
+    iterator = iter(batches)
+    while True:
+        start = time.perf_counter()
+        try:
+            batch = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            stats['generate_seconds'] += time.perf_counter() - start
+        stats['rows'] += len(batch)
+        yield batch
+
+
+def generate_table(task, upload_pool=None):
+    """Generate and save one table. Runs in the caller or in a pool worker.
+
+    ``task`` is a plain dict so it pickles cleanly to worker processes:
+    table, table_type, schema_path, output_path, is_local, seed,
+    reference_time, chunk_rows, output_format, dimension_key_ranges, the
+    Faker pool options, the scale_factor applied to schema row counts, an
+    optional num_rows override, an optional row_offset (rows start after it,
+    e.g. a dimension's growth) and an optional shard (see shard_tasks).
+    Tables are
+    streamed to the output file in chunks of ``chunk_rows`` rows. With an
+    ``upload_pool`` (in-process only), volume uploads are queued and finish
+    in the background; ``save_seconds`` then covers serialization only and
+    ``upload_seconds`` is None until the pool is drained. The table's
+    generator is kept for later iterations, see get_generator.
+
+    ``save_seconds`` splits into ``write_seconds``, spent in file writes (disk
+    I/O, or waiting on a streamed upload), and ``serialize_seconds``. For a
+    streamed upload it splits into ``serialize_seconds`` and
+    ``upload_seconds`` instead, and ``write_seconds`` is the part of the
+    upload the writer spent waiting on.
+    """
+    start = time.perf_counter()
+    generator = get_generator(task, upload_pool)
+    bytes_before = generator.bytes_written
+    write_before, upload_before = generator.write_seconds, generator.upload_seconds
+    stats = {'rows': 0, 'generate_seconds': 0.0}
+    batches = _timed(generator.generate_batches(task.get('chunk_rows')), stats)
+    output_path = generator.save_data(batches, task['table'])
+    total = time.perf_counter() - start
+    save_seconds = total - stats['generate_seconds']
+    write_seconds = generator.write_seconds - write_before
+    upload_seconds = None if task['is_local'] or upload_pool is not None else generator.upload_seconds - upload_before
+    # Writes into a streamed upload wait on the upload, which is timed on its own
+    serialize_seconds = save_seconds - (write_seconds if upload_seconds is None else upload_seconds)
+
+    return {
+        'table': task['table'],
+        'table_type': task['table_type'],
+        'output_path': output_path,
+        'num_rows': generator.num_rows,
+        'rows': stats['rows'],
+        'bytes': generator.bytes_written - bytes_before,
+        'generate_seconds': stats['generate_seconds'],
+        'save_seconds': save_seconds,
+        'serialize_seconds': serialize_seconds,
+        'write_seconds': write_seconds,
+        'upload_seconds': upload_seconds,
+    }
@@ -0,0 +1,111 @@
+import logging
+import os
+import threading
+import zlib
+
+import numpy as np
+from faker import Faker
+
+logger = logging.getLogger(__name__)
+
+# Faker-backed string providers, keyed by the name used for pools and cache files
+FAKER_PROVIDERS = {
+    'company': lambda fake: fake.company(),
+    'name': lambda fake: fake.name(),
+    'email': lambda fake: fake.email(),
+    'address': lambda fake: fake.address(),
+    'city': lambda fake: fake.city(),
+    'state': lambda fake: fake.state(),
+    'zipcode': lambda fake: fake.zipcode(),
+    'country': lambda fake: fake.country(),
+    'phone_number': lambda fake: f"({fake.random_number(digits=3)}) {fake.random_number(digits=3)}-{fake.random_number(digits=4)}",
+    'word': lambda fake: fake.word().title(),
+}
+
+# Process-wide pools keyed by (provider, size, locale)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class FakerPool:
+    """Precomputed values of one Faker provider, sampled by index."""
+
+    def __init__(self, provider, values):
+        self.provider = provider
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def sample(self, rand, cardinality=None):
+        """Draw a single value from the first ``cardinality`` pool entries with ``rand``, a random.Random."""
+        return str(self.values[rand.randrange(self._limit(cardinality))])
+
+    def sample_column(self, num_rows, rng, cardinality=None):
+        """Draw ``num_rows`` values from the first ``cardinality`` pool entries."""
+        indices = rng.integers(0, self._limit(cardinality), size=num_rows)
+        return self.values[indices].astype(object)
+
+    def _limit(self, cardinality):
+        if cardinality is None:
+            return len(self.values)
+        return max(1, min(int(cardinality), len(self.values)))
+
+
+def _pool_file(cache_dir, provider, size, locale):
+    return os.path.join(cache_dir, f"{provider}_{locale}_{size}.npy")
+
+
+def _save_pool(values, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temp file first so concurrent processes never map a partial pool
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, values)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved Faker pool to {path}")
+
+
+def build_pool(provider, size, fake):
+    """Generate ``size`` values with ``fake`` into a fixed-width string array.
+
+    ``fake`` is reseeded from the provider and size first, so a pool has the
+    same contents whichever generator, process or run builds it.
+    """
+    fake.seed_instance(zlib.crc32(f"{provider}:{size}".encode('utf-8')))
+    produce = FAKER_PROVIDERS[provider]
+    return np.array([produce(fake) for _ in range(size)], dtype=str)
+
+
+def get_pool(provider, size, fake, cache_dir=None):
+    """Return the process-wide pool for ``provider``, building it on first use.
+
+    With ``cache_dir`` set, pools are saved there as .npy files and later
+    processes memory-map them instead of calling Faker again.
+    """
+    locale = str(getattr(fake, 'locales', ['en_US'])[0])
+    key = (provider, size, locale)
+    with _pools_lock:
+        path = _pool_file(cache_dir, provider, size, locale) if cache_dir else None
+        pool = _pools.get(key)
+        if pool is not None:
+            if path and not os.path.exists(path):
+                _save_pool(pool.values, path)
+            return pool
+
+        values = None
+        if path and os.path.exists(path):
+            try:
+                values = np.load(path, mmap_mode='r')
+                logger.info(f"Memory-mapped Faker pool {provider} from {path}")
+            except Exception as e:
+                logger.warning(f"Could not load Faker pool {path}, rebuilding: {str(e)}")
+
+        if values is None:
+            logger.info(f"Building Faker pool {provider} with {size} values")
+            values = build_pool(provider, size, Faker(fake.locales))
+            if path:
+                _save_pool(values, path)
+
+        pool = FakerPool(provider, values)
+        _pools[key] = pool
+        return pool
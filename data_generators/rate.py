@@ -0,0 +1,178 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 15.0
+# Weight of the latest iteration when updating the rows/bytes per requested row estimates
+SMOOTHING = 0.5
+# Only fact and change feed tables are re-generated every iteration
+RATED_TABLE_TYPES = ('fact', 'change_feed')
+
+
+class RateController:
+    """Paces generation iterations and sizes tables to hit throughput targets.
+
+    Iterations start every ``interval_seconds``. Time spent generating is
+    subtracted from the wait, and an iteration that overruns is followed
+    immediately by the next one. A throughput target can be set per industry
+    (``rows_per_second`` / ``mb_per_second`` here, split across the tables
+    by their YAML num_rows) or per table with the same keys in the table's
+    YAML. For each targeted table the controller learns how many output rows
+    and bytes one requested row produces, since change feeds emit several rows
+    per key and bytes per row depend on the output format, and picks
+    num_rows for the next iteration from that.
+    """
+
+    def __init__(self, interval_seconds=DEFAULT_INTERVAL_SECONDS, rows_per_second=None, mb_per_second=None, stop_event=None):
+        if interval_seconds <= 0:
+            raise ValueError(f"Generation interval must be positive, got {interval_seconds}")
+        if rows_per_second and mb_per_second:
+            raise ValueError("Set either a rows per second or an MB per second target, not both")
+        self.interval_seconds = interval_seconds
+        self.rows_per_second = rows_per_second
+        self.mb_per_second = mb_per_second
+        self._ratios = {}
+        self._next_start = None
+        self._iteration_start = None
+        self._stop = stop_event or threading.Event()
+        self.started_at = None
+        self.totals = {'rows': 0, 'bytes': 0}
+        self.last_report = None
+        # How late the current iteration started against the cadence
+        self.lag_seconds = 0.0
+
+    @staticmethod
+    def _schema_target(schema):
+        if schema.get('rows_per_second'):
+            return 'rows', float(schema['rows_per_second'])
+        if schema.get('mb_per_second'):
+            return 'bytes', float(schema['mb_per_second']) * 1024 * 1024
+        return None
+
+    def targets(self, schemas):
+        """Per-table throughput targets as {table: (unit, per_second)}, unit 'rows' or 'bytes'."""
+        rated = [s for s in schemas if s.get('type', 'fact') in RATED_TABLE_TYPES]
+        targets = {}
+        shared = []
+        for schema in rated:
+            target = self._schema_target(schema)
+            if target is not None:
+                targets[schema['table']] = target
+            else:
+                shared.append(schema)
+
+        if self.rows_per_second:
+            unit, total = 'rows', float(self.rows_per_second)
+        elif self.mb_per_second:
+            unit, total = 'bytes', float(self.mb_per_second) * 1024 * 1024
+        else:
+            return targets
+
+        weights = {s['table']: s.get('num_rows', 10) for s in shared}
+        weight_sum = sum(weights.values()) or 1
+        for table, weight in weights.items():
+            targets[table] = (unit, total * weight / weight_sum)
+        return targets
+
+    def plan(self, schemas):
+        """Return {table: num_rows} for every table with a target in this iteration."""
+        plan = {}
+        for table, (unit, per_second) in self.targets(schemas).items():
+            ratio = self._ratios.get(table, {}).get(unit)
+            if ratio is None:
+                if unit == 'bytes':
+                    # Bytes per row are unknown until the table has been written once
+                    continue
+                ratio = 1.0
+            plan[table] = max(1, round(per_second * self.interval_seconds / ratio))
+        return plan
+
+    def start_iteration(self):
+        """Mark the start of an iteration and measure how late it starts against the cadence."""
+        now = time.monotonic()
+        if self.started_at is None:
+            self.started_at = now
+        self.lag_seconds = 0.0 if self._next_start is None else max(0.0, now - self._next_start)
+        self._iteration_start = now
+        self._next_start = now + self.interval_seconds
+
+    def record(self, schemas, results):
+        """Learn from an iteration's table results and report achieved vs. target rate."""
+        elapsed = time.monotonic() - self._iteration_start
+        # The iteration's share of wall time is the cadence, or longer when it overran
+        period = max(self.interval_seconds, elapsed)
+        targets = self.targets(schemas)
+
+        tables = {}
+        for result in results:
+            table = result['table']
+            self.totals['rows'] += result['rows']
+            self.totals['bytes'] += result['bytes']
+            if result['num_rows']:
+                observed = {
+                    'rows': result['rows'] / result['num_rows'],
+                    'bytes': result['bytes'] / result['num_rows'],
+                }
+                previous = self._ratios.get(table)
+                self._ratios[table] = observed if previous is None else {
+                    unit: SMOOTHING * observed[unit] + (1 - SMOOTHING) * previous[unit] for unit in observed
+                }
+            if table not in targets:
+                continue
+            unit, per_second = targets[table]
+            achieved = (result['rows'] if unit == 'rows' else result['bytes']) / period
+            tables[table] = {'unit': unit, 'target': per_second, 'achieved': achieved}
+            logger.info(
+                f"Table {table}: {self._format_rate(achieved, unit)} achieved, "
+                f"target {self._format_rate(per_second, unit)} ({achieved / per_second:.0%})"
+            )
+
+        for unit in ('rows', 'bytes'):
+            rated = [t for t in tables.values() if t['unit'] == unit]
+            if len(rated) > 1:
+                achieved = sum(t['achieved'] for t in rated)
+                target = sum(t['target'] for t in rated)
+                logger.info(
+                    f"All {len(rated)} targeted tables: {self._format_rate(achieved, unit)} achieved, "
+                    f"target {self._format_rate(target, unit)} ({achieved / target:.0%})"
+                )
+
+        rows = sum(r['rows'] for r in results)
+        size = sum(r['bytes'] for r in results)
+        if elapsed > self.interval_seconds:
+            logger.warning(
+                f"Iteration took {elapsed:.2f}s, longer than the {self.interval_seconds:.0f}s interval; "
+                f"targets cannot be met at this cadence"
+            )
+        logger.info(
+            f"Iteration rate: {self._format_rate(rows / period, 'rows')}, {self._format_rate(size / period, 'bytes')} "
+            f"over {period:.2f}s"
+        )
+        self.last_report = {
+            'elapsed_seconds': elapsed,
+            'period_seconds': period,
+            'lag_seconds': self.lag_seconds,
+            'rows_per_second': rows / period,
+            'bytes_per_second': size / period,
+            'tables': tables,
+        }
+        return self.last_report
+
+    @staticmethod
+    def _format_rate(per_second, unit):
+        if unit == 'bytes':
+            return f"{per_second / 1024 / 1024:.2f} MB/s"
+        return f"{per_second:,.0f} rows/s"
+
+    def wait(self):
+        """Sleep until the next iteration is due; returns False if stopped while waiting."""
+        if self._next_start is None:
+            return not self._stop.is_set()
+        delay = max(0.0, self._next_start - time.monotonic())
+        return not self._stop.wait(delay)
+
+    def stop(self):
+        """Interrupt a pending wait()."""
+        self._stop.set()
@@ -0,0 +1,146 @@
+import numpy as np
+
+# distribution.type values of a foreign key column; uniform keeps the plain integer draw
+DISTRIBUTIONS = ('uniform', 'zipf', 'hot_keys', 'normal', 'weights')
+
+
+class AliasSampler:
+    """Draws from a fixed discrete distribution over 0..n-1 in O(1) per draw.
+
+    Alias method: every slot keeps its own outcome with probability
+    ``prob[i]`` and its ``alias`` otherwise, so a batch of draws costs one
+    uniform number and one lookup each. The table is built without a Python
+    loop, from prefix sums: laying the light slots' deficits (1 - p) and the
+    heavy slots' excesses (p - 1) out on one line each, a light slot is
+    aliased to the heavy slot whose excess covers the start of its deficit.
+    A heavy slot that gives away more than its excess, because the last
+    light it covers runs past its end, hands the overflow on to the next
+    heavy slot through its own alias.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        if len(weights) == 0 or total <= 0 or (weights < 0).any():
+            raise ValueError("Alias sampler needs non-negative weights with a positive sum")
+        n = len(weights)
+        scaled = weights * (n / total)
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+
+        light = np.flatnonzero(scaled < 1.0)
+        heavy = np.flatnonzero(scaled >= 1.0)
+        if len(light) and len(heavy):
+            deficits = np.concatenate(([0.0], np.cumsum(1.0 - scaled[light])))
+            excesses = np.concatenate(([0.0], np.cumsum(scaled[heavy] - 1.0)))
+            owner = np.minimum(np.searchsorted(excesses[1:], deficits[:-1], side='right'), len(heavy) - 1)
+            self.prob[light] = scaled[light]
+            self.alias[light] = heavy[owner]
+            # Overflow past each heavy slot's end, up to the end of the deficit running across it;
+            # the last heavy slot has none up to rounding
+            ends = excesses[1:-1]
+            crossing = np.minimum(np.searchsorted(deficits, ends, side='left'), len(deficits) - 1)
+            self.prob[heavy[:-1]] = 1.0 - np.clip(deficits[crossing] - ends, 0.0, 1.0)
+            self.alias[heavy[:-1]] = heavy[1:]
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng, size):
+        """Draw ``size`` outcomes in 0..n-1."""
+        draws = rng.random(size) * len(self.prob)
+        slots = draws.astype(np.int64)
+        return np.where(draws - slots < self.prob[slots], slots, self.alias[slots])
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_distribution(spec):
+    """Check a distribution spec's type and parameters, raising ValueError if one is missing or invalid."""
+    if not isinstance(spec, dict):
+        raise ValueError(f"distribution must be a mapping, got {type(spec).__name__}")
+    kind = spec.get('type', 'uniform')
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {kind!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+    if kind == 'zipf' and not (_is_number(spec.get('exponent', 1.0)) and spec.get('exponent', 1.0) > 0):
+        raise ValueError("zipf exponent must be a positive number")
+    if kind == 'hot_keys':
+        if not (_is_number(spec.get('share')) and 0 <= spec['share'] <= 1):
+            raise ValueError("hot_keys needs a share between 0 and 1")
+        if not (_is_number(spec.get('keys', 1)) and spec.get('keys', 1) > 0):
+            raise ValueError("hot_keys keys must be a positive count or fraction")
+    if kind == 'normal':
+        if not _is_number(spec.get('mean', 0.5)):
+            raise ValueError("normal mean must be a number (a fraction of the key range)")
+        if not (_is_number(spec.get('stddev', 0.1)) and spec.get('stddev', 0.1) > 0):
+            raise ValueError("normal stddev must be a positive number (a fraction of the key range)")
+    if kind == 'weights':
+        weights = spec.get('weights')
+        if not isinstance(weights, dict) or not weights:
+            raise ValueError("weights needs a non-empty weights mapping of key to weight")
+        values = list(weights.values()) + [spec.get('default', 0)]
+        if not all(_is_number(v) and v >= 0 for v in values) or not any(v > 0 for v in values):
+            raise ValueError("weights must be non-negative numbers, at least one of them positive")
+        if not all(isinstance(key, int) and not isinstance(key, bool) for key in weights):
+            raise ValueError("weights keys must be integer keys")
+    return spec
+
+
+def distribution_weights(spec, num_keys):
+    """Weights of keys 1..num_keys for a distribution spec (see DISTRIBUTIONS).
+
+    zipf:     ``exponent`` (default 1.0); key k has weight 1 / k ** exponent
+    hot_keys: ``keys`` hot keys (default 1; a value below 1 is a fraction of
+              the key range) receive ``share`` of the rows
+    normal:   ``mean`` and ``stddev`` as fractions of the key range (defaults
+              0.5 and 0.1), truncated to the range
+    weights:  ``weights`` maps keys to weights; other keys get ``default`` (0)
+    """
+    kind = spec.get('type', 'uniform')
+    keys = np.arange(1, num_keys + 1, dtype=np.float64)
+    if kind == 'uniform':
+        return np.ones(num_keys)
+    if kind == 'zipf':
+        return keys ** -float(spec.get('exponent', 1.0))
+    if kind == 'hot_keys':
+        hot = spec.get('keys', 1)
+        hot = int(round(hot * num_keys)) if hot < 1 else int(hot)
+        hot = min(max(hot, 1), num_keys)
+        share = float(spec['share'])
+        weights = np.full(num_keys, (1 - share) / max(num_keys - hot, 1))
+        weights[:hot] = share / hot if hot < num_keys else 1.0 / num_keys
+        return weights
+    if kind == 'normal':
+        mean = float(spec.get('mean', 0.5)) * num_keys
+        stddev = max(float(spec.get('stddev', 0.1)) * num_keys, 1e-9)
+        return np.exp(-0.5 * ((keys - mean) / stddev) ** 2) + 1e-300
+    if kind == 'weights':
+        weights = np.full(num_keys, float(spec.get('default', 0)))
+        for key, weight in spec['weights'].items():
+            if 1 <= int(key) <= num_keys:
+                weights[int(key) - 1] = float(weight)
+        return weights
+    raise ValueError(f"Unknown distribution {kind!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+
+
+class KeySampler:
+    """Foreign keys in 1..num_keys drawn from a distribution spec.
+
+    The alias table is built once per key range and rebuilt, in O(n)
+    vectorized steps, only when the range changes, e.g. when the referenced
+    dimension grows.
+    """
+
+    def __init__(self, spec):
+        self.spec = validate_distribution(spec)
+        self._sampler = None
+        self._num_keys = None
+
+    def sample(self, rng, num_keys, size):
+        """Draw ``size`` keys in 1..num_keys."""
+        if num_keys != self._num_keys:
+            self._sampler = AliasSampler(distribution_weights(self.spec, num_keys))
+            self._num_keys = num_keys
+        return self._sampler.sample(rng, size) + 1
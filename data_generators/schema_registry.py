@@ -0,0 +1,86 @@
+import logging
+import os
+import threading
+
+import yaml
+
+from .samplers import validate_distribution
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_EXTENSIONS = (".yml", ".yaml")
+
+# Process-wide cache: path -> (mtime_ns, size, parsed schema)
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def validate_schema(schema, path):
+    """Check the structure every generator relies on, raising ValueError if it is missing."""
+    if not isinstance(schema, dict):
+        raise ValueError(f"Schema {path} must be a mapping, got {type(schema).__name__}")
+    if not schema.get("table"):
+        raise ValueError(f"Schema {path} has no table name")
+    columns = schema.get("columns")
+    if not isinstance(columns, dict) or not columns:
+        raise ValueError(f"Schema {path} must define columns as a mapping")
+    for col, col_def in columns.items():
+        if isinstance(col_def, dict) and not isinstance(col_def.get("type", "string"), str):
+            raise ValueError(f"Schema {path}: column {col} has an invalid type")
+        if isinstance(col_def, dict) and col_def.get("distribution") is not None:
+            try:
+                validate_distribution(col_def["distribution"])
+            except ValueError as e:
+                raise ValueError(f"Schema {path}: column {col}: {e}")
+    if schema.get("type", "fact") == "change_feed" and "change_feed_rules" not in schema:
+        raise ValueError(f"Schema {path}: change_feed tables need change_feed_rules")
+    return schema
+
+
+def scaled_num_rows(schema, scale_factor=1):
+    """The table's num_rows (10 if unset) times ``scale_factor``, at least one row."""
+    return max(1, round(schema.get("num_rows", 10) * scale_factor))
+
+
+def load_schema(path):
+    """Return the parsed, validated schema at ``path``, re-reading it only when the file changed.
+
+    Every caller gets the same dict for an unchanged file, so schemas must be
+    treated as read-only.
+    """
+    stat = os.stat(path)
+    with _schemas_lock:
+        cached = _schemas.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        try:
+            with open(path) as f:
+                schema = validate_schema(yaml.safe_load(f), path)
+        except Exception as e:
+            logger.error(f"Error loading schema from file: {str(e)}")
+            raise
+        if cached is not None:
+            logger.info(f"Reloaded changed schema {path}")
+        _schemas[path] = (stat.st_mtime_ns, stat.st_size, schema)
+        return schema
+
+
+def load_schema_directory(directory):
+    """Return {path: schema} for every YAML schema in ``directory``, in file name order."""
+    paths = [
+        os.path.join(directory, file)
+        for file in sorted(os.listdir(directory))
+        if file.endswith(SCHEMA_EXTENSIONS)
+    ]
+    with _schemas_lock:
+        # Forget files that were removed from this directory
+        for path in [p for p in _schemas if os.path.dirname(p) == directory and p not in paths]:
+            del _schemas[path]
+    return {path: load_schema(path) for path in paths}
+
+
+def clear():
+    """Drop every cached schema."""
+    with _schemas_lock:
+        _schemas.clear()
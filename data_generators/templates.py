@@ -0,0 +1,98 @@
+import string
+
+import numpy as np
+import pandas as pd
+
+DIGITS = string.digits
+LETTERS = string.ascii_uppercase
+
+# Placeholder character -> alphabet it is drawn from
+PLACEHOLDERS = {'#': DIGITS, '?': LETTERS}
+
+
+class ChoiceTemplate:
+    """Pipe-separated choice list such as "RES|COM|IND"."""
+
+    def __init__(self, format_spec):
+        self.choices = format_spec.split('|')
+        # Categories are de-duplicated, but the lookup keeps duplicate weights
+        self.categories = list(dict.fromkeys(self.choices))
+        self._lookup = np.array([self.categories.index(choice) for choice in self.choices])
+
+    def render(self, rand):
+        """Pick a single choice with ``rand``, a random.Random."""
+        return rand.choice(self.choices)
+
+    def render_column(self, num_rows, rng):
+        """Pick ``num_rows`` choices as a categorical column."""
+        codes = self._lookup[rng.integers(0, len(self.choices), size=num_rows)]
+        return pd.Categorical.from_codes(codes, categories=self.categories)
+
+
+class PatternTemplate:
+    """Fixed-width pattern where ``#`` is a random digit and ``?`` a random letter.
+
+    The spec is parsed once into a byte layout; whole columns are rendered by
+    filling every placeholder slot from a single random array.
+    """
+
+    def __init__(self, format_spec, placeholders):
+        self.format_spec = format_spec
+        self.placeholders = placeholders
+        # Per-cell rendering: a str.format template plus one alphabet per slot
+        self._alphabets = [PLACEHOLDERS[c] for c in format_spec if c in placeholders]
+        self._format = ''.join(
+            '{}' if c in placeholders else c.replace('{', '{{').replace('}', '}}')
+            for c in format_spec
+        )
+        # Column rendering: the literal bytes with placeholder slots grouped by alphabet
+        self._layout = np.frombuffer(format_spec.encode('utf-8'), dtype=np.uint8)
+        self._slots = {
+            alphabet: np.flatnonzero(self._layout == ord(placeholder))
+            for placeholder, alphabet in PLACEHOLDERS.items()
+            if placeholder in placeholders
+        }
+        self._ascii = format_spec.isascii()
+
+    def render(self, rand):
+        """Render a single value with ``rand``, a random.Random."""
+        return self._format.format(*[rand.choice(alphabet) for alphabet in self._alphabets])
+
+    def render_column(self, num_rows, rng):
+        """Render ``num_rows`` values from one random draw per alphabet."""
+        width = len(self._layout)
+        buffer = np.empty((num_rows, width), dtype=np.uint8)
+        buffer[:] = self._layout
+        for alphabet, slots in self._slots.items():
+            if len(slots):
+                codes = np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)
+                buffer[:, slots] = codes[rng.integers(0, len(codes), size=(num_rows, len(slots)))]
+        raw = buffer.view(f'S{width}').ravel()
+        if self._ascii:
+            return raw.astype(f'U{width}').astype(object)
+        return np.char.decode(raw, 'utf-8').astype(object)
+
+
+class LiteralTemplate:
+    """Format without placeholders, returned as-is."""
+
+    def __init__(self, format_spec):
+        self.format_spec = format_spec
+
+    def render(self, rand):
+        return self.format_spec
+
+    def render_column(self, num_rows, rng):
+        return np.full(num_rows, self.format_spec, dtype=object)
+
+
+def compile_format(format_spec):
+    """Parse a column ``format`` spec into a reusable template."""
+    if '|' in format_spec:
+        return ChoiceTemplate(format_spec)
+    # '#' takes precedence: a spec with digits keeps any '?' as a literal
+    if '#' in format_spec:
+        return PatternTemplate(format_spec, '#')
+    if '?' in format_spec:
+        return PatternTemplate(format_spec, '?')
+    return LiteralTemplate(format_spec)
@@ -0,0 +1,108 @@
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .volumes import IN_MEMORY_UPLOAD_LIMIT, UPLOAD_BACKOFF_SECONDS, UPLOAD_RETRIES, get_workspace_client, upload_with_retry
+
+logger = logging.getLogger(__name__)
+
+
+class UploadPool:
+    """Bounded pool of upload threads, so the next table is generated while the last one uploads.
+
+    ``submit`` serializes a table into a spooled buffer (memory up to
+    IN_MEMORY_UPLOAD_LIMIT, then a temp file) and queues its upload. Once
+    ``max_pending`` uploads are queued or running, ``submit`` blocks until one
+    finishes, so a slow volume throttles generation instead of piling up
+    buffers. Buffered payloads are replayable, so every upload is retried on
+    transient errors.
+    """
+
+    def __init__(self, workers=4, max_pending=None, retries=UPLOAD_RETRIES, backoff=UPLOAD_BACKOFF_SECONDS, workspace=None):
+        if workers < 1:
+            raise ValueError(f"Upload pool needs at least one worker, got {workers}")
+        self.workers = workers
+        self.max_pending = max_pending or 2 * workers
+        self.retries = retries
+        self.backoff = backoff
+        self._workspace = workspace
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='upload')
+        self._futures = []
+        self._futures_lock = threading.Lock()
+        self.blocked_seconds = 0.0
+
+    @property
+    def workspace(self):
+        if self._workspace is None:
+            self._workspace = get_workspace_client()
+        return self._workspace
+
+    def submit(self, write, output_path):
+        """Serialize with ``write(binary_file)`` and queue the upload to ``output_path``."""
+        if not self._slots.acquire(blocking=False):
+            logger.info(f"Upload queue full ({self.max_pending} pending), waiting before {output_path}")
+            start = time.perf_counter()
+            self._slots.acquire()
+            self.blocked_seconds += time.perf_counter() - start
+
+        buffer = tempfile.SpooledTemporaryFile(max_size=IN_MEMORY_UPLOAD_LIMIT)
+        try:
+            start = time.perf_counter()
+            write(buffer)
+            serialize_seconds = time.perf_counter() - start
+            future = self._executor.submit(self._upload, buffer, output_path, serialize_seconds)
+        except BaseException:
+            buffer.close()
+            self._slots.release()
+            raise
+
+        with self._futures_lock:
+            self._futures.append(future)
+        return future
+
+    def _upload(self, buffer, output_path, serialize_seconds):
+        try:
+            size = buffer.seek(0, 2)
+            start = time.perf_counter()
+            retries = upload_with_retry(self.workspace, output_path, buffer, self.retries, self.backoff)
+            stats = {
+                'output_path': output_path,
+                'bytes': size,
+                'retries': retries,
+                'serialize_seconds': serialize_seconds,
+                'upload_seconds': time.perf_counter() - start,
+            }
+            logger.info(
+                f"Uploaded {size} bytes to {output_path}: serialization {serialize_seconds:.2f}s, "
+                f"upload {stats['upload_seconds']:.2f}s, {retries} retries"
+            )
+            return stats
+        finally:
+            buffer.close()
+            self._slots.release()
+
+    def drain(self):
+        """Wait for every queued upload and return their stats.
+
+        All uploads are waited on before the first failure is re-raised, so no
+        upload is left running against a half-finished iteration.
+        """
+        with self._futures_lock:
+            futures, self._futures = self._futures, []
+        results, error = [], None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Upload failed: {str(e)}")
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    def shutdown(self, wait=True):
+        """Stop the upload threads, cancelling uploads that have not started."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,211 @@
+import io
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Payloads up to this size are uploaded from memory in a single request;
+# larger ones are streamed to the Files API while they are still being written
+IN_MEMORY_UPLOAD_LIMIT = 64 * 1024 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Files API calls failing with these are retried with exponential backoff
+UPLOAD_RETRIES = 3
+UPLOAD_BACKOFF_SECONDS = 1.0
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = {
+    'Aborted', 'DeadlineExceeded', 'InternalError', 'RequestLimitExceeded',
+    'ResourceExhausted', 'TemporarilyUnavailable', 'TooManyRequests',
+}
+
+# Private generator so backoff jitter never disturbs seeded data generation
+_jitter = random.Random()
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_workspace_client():
+    """Return the process-wide WorkspaceClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from databricks.sdk import WorkspaceClient
+            _client = WorkspaceClient()
+        return _client
+
+
+def set_workspace_client(client):
+    """Use ``client`` for all volume operations, e.g. a local stand-in for the Files API."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def is_transient(error):
+    """Whether a failed Files API call is worth retrying."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in TRANSIENT_ERRORS:
+        return True
+    status_code = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    return status_code in TRANSIENT_STATUS_CODES
+
+
+def call_with_retry(call, description, retries=UPLOAD_RETRIES, backoff=UPLOAD_BACKOFF_SECONDS):
+    """Run ``call()``, retrying transient failures with exponential backoff.
+
+    Returns the call's result and the number of retries that were needed.
+    """
+    attempt = 0
+    while True:
+        try:
+            return call(), attempt
+        except Exception as e:
+            if attempt >= retries or not is_transient(e):
+                raise
+            delay = getattr(e, 'retry_after_secs', None) or backoff * 2 ** attempt * _jitter.uniform(0.5, 1.5)
+            attempt += 1
+            logger.warning(f"{description} failed ({str(e)}), retry {attempt}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def upload_with_retry(workspace, output_path, contents, retries=UPLOAD_RETRIES, backoff=UPLOAD_BACKOFF_SECONDS):
+    """Upload a seekable file, retrying transient failures with exponential backoff.
+
+    Returns the number of retries that were needed.
+    """
+    def upload():
+        contents.seek(0)
+        workspace.files.upload(
+            file_path=output_path,
+            contents=contents,
+            overwrite=True
+        )
+
+    return call_with_retry(upload, f"Upload of {output_path}", retries, backoff)[1]
+
+
+class _PipeWriter(io.RawIOBase):
+    """Write end of an OS pipe that records bytes written and time spent blocked."""
+
+    def __init__(self, fd):
+        self._fd = fd
+        self.bytes_written = 0
+        self.blocked_seconds = 0.0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        start = time.perf_counter()
+        written = os.write(self._fd, b)
+        self.blocked_seconds += time.perf_counter() - start
+        self.bytes_written += written
+        return written
+
+    def close(self):
+        if not self.closed:
+            os.close(self._fd)
+        super().close()
+
+
+class _PrefixedReader(io.RawIOBase):
+    """Readable stream that replays an in-memory prefix before the rest of a pipe."""
+
+    def __init__(self, prefix, rest):
+        self._prefix = memoryview(prefix)
+        self._rest = rest
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._prefix:
+            n = min(len(b), len(self._prefix))
+            b[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        return self._rest.readinto(b)
+
+
+def upload_stream(write, output_path, workspace=None):
+    """Serialize with ``write(binary_file)`` straight into a Files API upload.
+
+    ``write`` runs in a helper thread and writes into a pipe that the upload
+    reads from, so no temp file is created and at most IN_MEMORY_UPLOAD_LIMIT
+    bytes are held in memory. Returns the byte count and timings:
+    ``serialize_seconds`` is the writer's busy time, which includes producing
+    lazily generated batches, and ``upload_seconds`` the time spent on the
+    upload beyond it. A payload that fits in memory is timed from the end of
+    serialization; a streamed one overlaps the writer, so its upload time is
+    the stream's wall time minus the writer's busy time.
+    """
+    workspace = workspace or get_workspace_client()
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, 'rb')
+    pipe = _PipeWriter(write_fd)
+    writer_state = {'error': None, 'seconds': 0.0}
+
+    def serialize():
+        start = time.perf_counter()
+        try:
+            with io.BufferedWriter(pipe, WRITE_BUFFER_SIZE) as f:
+                write(f)
+        except BaseException as e:
+            writer_state['error'] = e
+            pipe.close()
+        finally:
+            writer_state['seconds'] = time.perf_counter() - start
+
+    writer = threading.Thread(target=serialize, name=f"serialize {os.path.basename(output_path)}", daemon=True)
+    start = time.perf_counter()
+    writer.start()
+    try:
+        prefix = reader.read(IN_MEMORY_UPLOAD_LIMIT)
+        if len(prefix) < IN_MEMORY_UPLOAD_LIMIT:
+            # Whole payload fits in memory: one seekable, retryable upload
+            writer.join()
+            if writer_state['error'] is not None:
+                raise writer_state['error']
+            upload_start = time.perf_counter()
+            upload_with_retry(workspace, output_path, io.BytesIO(prefix))
+            upload_seconds = time.perf_counter() - upload_start
+        else:
+            # A stream cannot be replayed, so large uploads are attempted once
+            contents = io.BufferedReader(_PrefixedReader(prefix, reader), WRITE_BUFFER_SIZE)
+            workspace.files.upload(
+                file_path=output_path,
+                contents=contents,
+                overwrite=True
+            )
+            upload_seconds = None
+    finally:
+        # Unblocks the writer if the upload failed part-way
+        reader.close()
+        writer.join()
+
+    if writer_state['error'] is not None:
+        # The writer failed after streaming started, so the uploaded file is truncated
+        try:
+            workspace.files.delete(output_path)
+        except Exception as e:
+            logger.warning(f"Could not remove truncated upload {output_path}: {str(e)}")
+        raise writer_state['error']
+
+    serialize_seconds = writer_state['seconds'] - pipe.blocked_seconds
+    if upload_seconds is None:
+        upload_seconds = max(time.perf_counter() - start - serialize_seconds, 0.0)
+    stats = {
+        'bytes': pipe.bytes_written,
+        'serialize_seconds': serialize_seconds,
+        'upload_seconds': upload_seconds,
+    }
+    logger.info(
+        f"Uploaded {stats['bytes']} bytes to {output_path}: "
+        f"serialization {stats['serialize_seconds']:.2f}s, upload {stats['upload_seconds']:.2f}s"
+    )
+    return stats
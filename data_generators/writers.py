@@ -0,0 +1,175 @@
+import gzip
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_OUTPUT_FORMAT = 'csv'
+
+
+class CountingWriter(io.RawIOBase):
+    """Write-through wrapper that counts the bytes passed on to a binary file.
+
+    ``write_seconds`` adds up the time spent in the underlying file's write(),
+    i.e. disk I/O or waiting on an upload, as opposed to serialization.
+    """
+
+    def __init__(self, binary_file):
+        self._file = binary_file
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        start = time.perf_counter()
+        written = self._file.write(b)
+        self.write_seconds += time.perf_counter() - start
+        written = len(memoryview(b).cast('B')) if written is None else written
+        self.bytes_written += written
+        return written
+
+    def flush(self):
+        self._file.flush()
+
+
+def iso_datetime_columns(df):
+    """Replace datetime columns with ISO 8601 strings in the layout of datetime.isoformat().
+
+    Like isoformat(), microseconds are only written when there are any: a
+    column without a sub-second part is written to the second. Missing
+    values stay empty.
+    """
+    columns = [col for col in df.columns if df[col].dtype.kind == 'M']
+    if not columns:
+        return df
+    df = df.copy(deep=False)
+    for col in columns:
+        values = df[col].to_numpy(dtype='datetime64[us]')
+        missing = np.isnat(values)
+        present = values[~missing]
+        unit = 's' if (present == present.astype('datetime64[s]')).all() else 'us'
+        text = np.datetime_as_string(values, unit=unit).astype(object)
+        text[missing] = None
+        df[col] = text
+    return df
+
+
+def write_csv(batches, f):
+    """Write DataFrame batches to one CSV text stream, the header only ahead of the first batch."""
+    header = True
+    for df in batches:
+        iso_datetime_columns(df).to_csv(f, index=False, header=header)
+        header = False
+
+
+def write_jsonl(batches, f):
+    """Write DataFrame batches as JSON lines, one record per row."""
+    for df in batches:
+        text = df.to_json(orient='records', lines=True, date_format='iso', date_unit='us')
+        f.write(text if text.endswith('\n') or not text else text + '\n')
+
+
+def _text_writer(write):
+    """Adapt a text writer to a binary stream, optionally through a compressor."""
+    def writer(batches, binary_file, column_types=None, compression=None):
+        if compression == 'gzip':
+            stream = gzip.GzipFile(fileobj=binary_file, mode='wb')
+        elif compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd output requires the 'zstandard' package")
+            stream = zstandard.ZstdCompressor().stream_writer(binary_file, closefd=False)
+        else:
+            stream = binary_file
+
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        write(batches, text)
+        text.flush()
+        # Detach so closing the wrapper never closes the caller's file
+        text.detach()
+        if stream is not binary_file:
+            stream.close()
+    return writer
+
+
+def arrow_type(dtype):
+    """Map a schema column type to a Parquet (Arrow) type."""
+    import pyarrow as pa
+    return {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'decimal': pa.float64(),
+        'bool': pa.bool_(),
+        'datetime': pa.timestamp('us'),
+        'string': pa.string(),
+    }.get(dtype)
+
+
+def arrow_schema(df, column_types):
+    """Arrow schema for a batch: YAML column types where known, inferred otherwise."""
+    import pyarrow as pa
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in inferred:
+        target = arrow_type((column_types or {}).get(field.name))
+        if target is None:
+            target = pa.string() if pa.types.is_dictionary(field.type) or pa.types.is_null(field.type) else field.type
+        fields.append(pa.field(field.name, target))
+    return pa.schema(fields)
+
+
+def write_parquet(batches, binary_file, column_types=None, compression=None):
+    """Write DataFrame batches as row groups of one Parquet file."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output requires the 'pyarrow' package")
+
+    writer = None
+    try:
+        for df in batches:
+            if writer is None:
+                # The schema is fixed by the first batch so every row group matches
+                schema = arrow_schema(df, column_types)
+                writer = pq.ParquetWriter(binary_file, schema, compression=compression or 'snappy')
+            table = pa.Table.from_pandas(df, preserve_index=False).select(schema.names).cast(schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Output format -> file extension, Spark/Auto Loader reader format and writer
+OUTPUT_FORMATS = {
+    'csv': {'label': 'CSV', 'extension': '.csv', 'reader': 'csv',
+            'write': _text_writer(write_csv), 'compression': None},
+    'csv_gzip': {'label': 'CSV (gzip)', 'extension': '.csv.gz', 'reader': 'csv',
+                 'write': _text_writer(write_csv), 'compression': 'gzip'},
+    'csv_zstd': {'label': 'CSV (zstd)', 'extension': '.csv.zst', 'reader': 'csv',
+                 'write': _text_writer(write_csv), 'compression': 'zstd'},
+    'jsonl': {'label': 'JSON Lines', 'extension': '.json', 'reader': 'json',
+              'write': _text_writer(write_jsonl), 'compression': None},
+    'parquet': {'label': 'Parquet', 'extension': '.parquet', 'reader': 'parquet',
+                'write': write_parquet, 'compression': 'snappy'},
+}
+
+
+def write_batches(batches, binary_file, output_format=DEFAULT_OUTPUT_FORMAT, column_types=None):
+    """Write DataFrame batches to a binary file object in the given output format.
+
+    Returns the number of bytes written. Pass a CountingWriter as
+    ``binary_file`` to also read the time spent in writes from it.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    spec = OUTPUT_FORMATS[output_format]
+    if isinstance(batches, pd.DataFrame):
+        batches = [batches]
+    counter = binary_file if isinstance(binary_file, CountingWriter) else CountingWriter(binary_file)
+    spec['write'](batches, counter, column_types=column_types, compression=spec['compression'])
+    return counter.bytes_written
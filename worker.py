@@ -0,0 +1,38 @@
+"""Generation worker for coordinator mode.
+
+Serves table tasks over HTTP (see data_generators.distributed): the
+coordinator, i.e. the app or backfill.py started with STREAMFORGE_WORKER_URLS
+listing this worker's URL, sends each table or row-range shard of an
+iteration to one of its workers, which generates and writes it and reports
+back. Workers on other hosts need this repository's schema directory and,
+for volume output, Databricks credentials; local output paths are written
+on the worker's own filesystem.
+
+Usage: python worker.py [--host 0.0.0.0] [--port 8765] [--processes 8]
+"""
+import argparse
+import logging
+import os
+
+from data_generators.distributed import serve_worker
+
+SCHEMA_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (0.0.0.0 for other hosts)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="tables generated at once, each in its own process (default: one per CPU)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        serve_worker(args.host, args.port, args.processes, schema_dir=SCHEMA_BASE_PATH)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()